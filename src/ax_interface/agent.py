@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 from .mib import MIBTable, MIBMeta
 from .socket_io import SocketManager
@@ -8,7 +9,8 @@ BACKGROUND_WAIT_TIMEOUT = 10  # seconds
 
 
 class Agent:
-    def __init__(self, mib_cls, update_frequency, loop):
+    def __init__(self, mib_cls, update_frequency, loop, materialize=False, update_workers=0, update_intervals=None,
+                 idle_timeout=None):
         if not type(mib_cls) is MIBMeta:
             raise ValueError("Expected a class with type: {}".format(MIBMeta))
 
@@ -19,8 +21,12 @@ class Agent:
         self.oid_updaters_enabled = asyncio.Event(loop=loop)
         self.stopped = asyncio.Event(loop=loop)
 
+        # worker threads for the MIB updaters (0 updates on the event loop)
+        self.update_executor = ThreadPoolExecutor(max_workers=update_workers) if update_workers else None
+
         # Initialize our MIB
-        self.mib_table = MIBTable(mib_cls, update_frequency)
+        self.mib_table = MIBTable(mib_cls, update_frequency, materialize, self.update_executor, update_intervals,
+                                  idle_timeout)
 
         # containers
         self.socket_mgr = SocketManager(self.mib_table, self.run_enabled, self.loop)
@@ -48,6 +54,9 @@ class Agent:
             # wait for handlers to come back
             await asyncio.wait_for(background_task, BACKGROUND_WAIT_TIMEOUT, loop=self.loop)
 
+        if self.update_executor is not None:
+            self.update_executor.shutdown(wait=False)
+
         # signal that we're done!
         self.stopped.set()
 
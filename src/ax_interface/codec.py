@@ -0,0 +1,112 @@
+"""
+Precompiled struct codecs for the 'AgentX Encodings' (https://tools.ietf.org/html/rfc2741#section-5)
+and the PDU header (https://tools.ietf.org/html/rfc2741#section-6.1).
+
+Format strings depend on the byte order of the PDU and, for Object Identifiers and Octet Strings, on the
+number of sub-identifiers or octets. Rather than re-parsing a format string on every call, each distinct
+layout is compiled into a :class:`struct.Struct` once and looked up by key afterwards.
+"""
+
+import struct
+
+from . import util
+
+# '!' network-byte-order (big-endian), '<' little-endian. See PDUHeaderTags.endianness
+ENDIANNESSES = ('!', '<')
+
+# Object Identifier lengths compiled at import. Covers the registered subtrees as well as the
+# instance OIDs of the interface, LLDP, FDB and route tables (10-24 sub-identifiers).
+PRECOMPILED_SUBID_COUNTS = range(0, 25)
+
+
+# Longest Octet String whose codec is cached. Lengths come from the peer: longer strings get a fresh codec each time,
+# so the cache cannot be grown without bound.
+MAX_CACHED_OCTET_STRING_LENGTH = 255
+
+
+class StructTable(dict):
+    """
+    Cache of :class:`struct.Struct` objects. Missing keys are compiled on first use.
+    """
+
+    def __init__(self, format_factory, cacheable=None):
+        """
+        :param format_factory: key (unpacked, if a tuple) -> struct format string.
+        :param cacheable: key (unpacked, if a tuple) -> whether to keep its codec. Defaults to every key.
+        """
+        super().__init__()
+        self.format_factory = format_factory
+        self.cacheable = cacheable
+
+    def __missing__(self, key):
+        args = key if type(key) is tuple else (key,)
+        compiled = struct.Struct(self.format_factory(*args))
+        if self.cacheable is None or self.cacheable(*args):
+            self[key] = compiled
+        return compiled
+
+
+# Keyed by endianness.
+UINT32 = StructTable(lambda endianness: endianness + 'L')
+UINT64 = StructTable(lambda endianness: endianness + 'Q')
+VARBIND_HEADER = StructTable(lambda endianness: endianness + 'HH')
+PDU_HEADER_IDS = StructTable(lambda endianness: endianness + 'LLLL')
+RESPONSE_FIELDS = StructTable(lambda endianness: endianness + 'LHH')
+GET_BULK_FIELDS = StructTable(lambda endianness: endianness + 'HH')
+
+# Single byte fields--byte order does not apply.
+PDU_HEADER_TAGS = struct.Struct('!BBBB')
+OID_HEADER = struct.Struct('BBBB')
+
+# Keyed by (endianness, n_subid). n_subid is a single byte on the wire, which bounds the cache.
+OID = StructTable(lambda endianness, n_subid: endianness + 'BBBB' + str(n_subid) + 'L')
+
+# Keyed by (endianness, string length). The padding length is derived from the string length.
+OCTET_STRING = StructTable(lambda endianness, length: '{}L{}s{}s'.format(endianness, length, util.pad4(length)),
+                           lambda endianness, length: length <= MAX_CACHED_OCTET_STRING_LENGTH)
+
+
+def pack_oid_into(buffer, offset, endianness, n_subid, prefix, include, reserved, subids):
+    """
+    :return: the offset immediately following the OID.
+    """
+    oid_struct = OID[endianness, len(subids)]
+    oid_struct.pack_into(buffer, offset, n_subid, prefix, include, reserved, *subids)
+    return offset + oid_struct.size
+
+
+def unpack_oid_from(buffer, endianness, offset=0):
+    """
+    :return: tuple(n_subid, prefix, include, reserved, subids)
+    """
+    n_subid = OID_HEADER.unpack_from(buffer, offset)[0]
+    fields = OID[endianness, n_subid].unpack_from(buffer, offset)
+    return fields[:4] + (fields[4:],)
+
+
+def pack_octet_string_into(buffer, offset, endianness, length, string, padding):
+    """
+    :return: the offset immediately following the octet string (and its padding).
+    """
+    string_struct = OCTET_STRING[endianness, length]
+    string_struct.pack_into(buffer, offset, length, string, padding)
+    return offset + string_struct.size
+
+
+def unpack_octet_string_from(buffer, endianness, offset=0):
+    """
+    :return: tuple(length, string, padding)
+    """
+    length = UINT32[endianness].unpack_from(buffer, offset)[0]
+    return OCTET_STRING[endianness, length].unpack_from(buffer, offset)
+
+
+def _warm():
+    for endianness in ENDIANNESSES:
+        for table in (UINT32, UINT64, VARBIND_HEADER, PDU_HEADER_IDS, RESPONSE_FIELDS, GET_BULK_FIELDS):
+            table[endianness]
+        for n_subid in PRECOMPILED_SUBID_COUNTS:
+            OID[endianness, n_subid]
+
+
+_warm()
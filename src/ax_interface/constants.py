@@ -14,6 +14,10 @@ AGENTX_MINIMUM_PDU_SIZE = AGENTX_HEADER_LENGTH
 # 00122 #define SNMP_MAX_MSG_SIZE          1472 /* ethernet MTU minus IP/UDP header */
 SNMP_MAX_MSG_SIZE = 1472
 
+# Largest h.payload_length accepted from the master agent. Requests are bounded by the SNMP message size (at most
+# 64K over UDP); their AgentX encoding (a SearchRange of two uncompressed OIDs per variable) is several times larger.
+AGENTX_MAX_PAYLOAD_LENGTH = 1 << 20
+
 # 1.3.6.1
 INTERNET_PREFIX = (1, 3, 6, 1)
 
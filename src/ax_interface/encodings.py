@@ -2,10 +2,9 @@
 'AgentX Encodings' as described in https://tools.ietf.org/html/rfc2741#section-5
 """
 
-import struct
 from collections import namedtuple
 
-from . import constants, util
+from . import codec, constants, util
 
 
 class ObjectIdentifier(
@@ -43,14 +42,24 @@ class ObjectIdentifier(
 
     @property
     def size(self):
-        return 4 + 4 * self.n_subid
+        # the encoded size follows the sub-identifiers actually present (see to_bytes)
+        return 4 + 4 * len(self.subids)
 
     def to_tuple(self):
         return self.prefix + self.subids
 
     def to_bytes(self, endianness):
-        format_string = endianness + 'BBBB' + str(len(self.subids)) + 'L'
-        return struct.pack(format_string, self.n_subid, self.prefix_, self.include, self.reserved, *self.subids)
+        return codec.OID[endianness, len(self.subids)].pack(
+            self.n_subid, self.prefix_, self.include, self.reserved, *self.subids)
+
+    def pack_into(self, buffer, offset, endianness):
+        """
+        Encodes the OID into a writable buffer.
+
+        :return: the offset immediately following the OID.
+        """
+        return codec.pack_oid_into(buffer, offset, endianness,
+                                   self.n_subid, self.prefix_, self.include, self.reserved, self.subids)
 
     def inc(self):
         """
@@ -72,7 +81,7 @@ class ObjectIdentifier(
         return cls(len(subids), prefix, 0, 0, subids)
 
     @classmethod
-    def from_bytes(cls, byte_string, endianness):
+    def from_bytes(cls, byte_string, endianness, offset=0):
         """
         +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
         |  n_subid      |  prefix       |    include    |  <reserved>   |
@@ -84,17 +93,13 @@ class ObjectIdentifier(
         |             subidentifier #n_subid                            |
         +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
-        :param byte_string: string to unpack
+        :param byte_string: string (or buffer view) to unpack
         :param endianness: '!' or '<' (big/little endian)
+        :param offset: position of the OID within byte_string
         :return: n-oids, does not modify the original buffer and the index following the end of the OID
         """
-        oid_attributes = (n_subid, prefix, _, reserved) = struct.unpack(endianness + 'BBBB', byte_string[:4])
-        start_offset = 4
-        end_offset = start_offset + n_subid * 4
-        subids = struct.unpack(endianness + n_subid * 'L', byte_string[start_offset:end_offset])
-
         # oid = (n_subid, prefix, _, reserved, (subid1, subid2, ...))
-        return cls(*oid_attributes, subids)
+        return cls(*codec.unpack_oid_from(byte_string, endianness, offset))
 
 
 class SearchRange(namedtuple('_SearchRange', ('start', 'end'))):
@@ -120,14 +125,20 @@ class SearchRange(namedtuple('_SearchRange', ('start', 'end'))):
         return self.start.size + self.end.size
 
     def to_bytes(self, endianness):
-        return self.start.to_bytes(endianness) + self.end.to_bytes(endianness)
+        buffer = bytearray(self.size)
+        self.pack_into(buffer, 0, endianness)
+        return bytes(buffer)
+
+    def pack_into(self, buffer, offset, endianness):
+        offset = self.start.pack_into(buffer, offset, endianness)
+        return self.end.pack_into(buffer, offset, endianness)
 
     @classmethod
-    def from_bytes(cls, byte_string, endianness):
+    def from_bytes(cls, byte_string, endianness, offset=0):
         # unpack the first OID
-        start = ObjectIdentifier.from_bytes(byte_string, endianness)
+        start = ObjectIdentifier.from_bytes(byte_string, endianness, offset)
         # unpack the second OID (resume at the end of the first)
-        end = ObjectIdentifier.from_bytes(byte_string[start.size:], endianness)
+        end = ObjectIdentifier.from_bytes(byte_string, endianness, offset + start.size)
         # compose our SearchRange tuple
         return cls(start, end)
 
@@ -154,11 +165,13 @@ class OctetString(namedtuple('_OctetString', ('length', 'string', 'padding'))):
         return cls(length, _string, util.pad4bytes(len(_string)))
 
     def to_bytes(self, endianness):
-        fmt = endianness + 'L{}s{}s'.format(self.length, util.pad4(self.length))
-        return struct.pack(fmt, self.length, self.string, self.padding)
+        return codec.OCTET_STRING[endianness, self.length].pack(self.length, self.string, self.padding)
+
+    def pack_into(self, buffer, offset, endianness):
+        return codec.pack_octet_string_into(buffer, offset, endianness, self.length, self.string, self.padding)
 
     @classmethod
-    def from_bytes(cls, byte_string, endianness):
+    def from_bytes(cls, byte_string, endianness, offset=0):
         """
         +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
         |                     Octet String Length (L)                   |
@@ -169,23 +182,13 @@ class OctetString(namedtuple('_OctetString', ('length', 'string', 'padding'))):
         |  Octet L - 1  |  Octet L      |       Padding (as required)   |
         +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
-        :param byte_string: string to unpack.
+        :param byte_string: string (or buffer view) to unpack.
         :param endianness: '!' or '<' (big/little endian)
+        :param offset: position of the octet string within byte_string
         :return: octet string tuple, new offset. does not modify the original buffer.
         """
-        # read the length string
-        string_length_bytes = byte_string[:4]
-        # look ahead to the length value
-        string_length = struct.unpack(endianness + 'L', string_length_bytes)[0]
-        # strings are padded to 4 bytes.
-        padding_length = util.pad4(string_length)
-
-        # E.g. !L101s3s -> (length[long], string, padding[string])
-        fmt = '{}L{}s{}s'.format(endianness, string_length, padding_length)
-        # calculate offset
-        size = struct.calcsize(fmt)
-        # format the context string
-        return cls(*struct.unpack(fmt, byte_string[:size]))
+        # E.g. !L101s3s -> (length[long], string, padding[string]); strings are padded to 4 bytes.
+        return cls(*codec.unpack_octet_string_from(byte_string, endianness, offset))
 
 
 class ValueRepresentation(namedtuple('_ValueRepresentation', ('type_', 'reserved', 'name', 'data'))):
@@ -226,36 +229,16 @@ class ValueRepresentation(namedtuple('_ValueRepresentation', ('type_', 'reserved
 
     @property
     def size(self):
-        size = 4 + self.name.size
-        typed_bind = constants.ValueType(self.type_)
-        if typed_bind in self.FOUR_BYTE_TYPES:
-            size += 4
-        elif typed_bind == constants.ValueType.COUNTER_64:
-            size += 8
-        elif typed_bind == constants.ValueType.OBJECT_IDENTIFIER or typed_bind in self.OCTET_STRINGS:
-            size += self.data.size
-        elif typed_bind in self.EMPTY_TYPES:
-            # _size += 0
-            pass
-        return size
+        return 4 + self.name.size + _value_codec(self.type_).size(self.data)
 
     @classmethod
     def from_typecast(cls, type_, oid_iter_or_obj, data):
         oid = ObjectIdentifier.from_iterable(oid_iter_or_obj) \
             if type(oid_iter_or_obj) is not ObjectIdentifier else oid_iter_or_obj
-        if type_ in cls.OCTET_STRINGS:
-            _data = OctetString.from_string(data)
-        elif type_ == constants.ValueType.OBJECT_IDENTIFIER:
-            _data = ObjectIdentifier.from_iterable(data) if type(data) is not ObjectIdentifier else data
-        elif type_ in cls.EMPTY_TYPES:
-            _data = None
-        else:
-            _data = data
-
-        return cls(type_, 0, oid, _data)
+        return cls(type_, 0, oid, _value_codec(type_).cast(data))
 
     @classmethod
-    def _unpack_data(cls, type_, byte_string, endianness):
+    def _unpack_data(cls, type_, byte_string, endianness, offset=0):
         """
         -  Integer, Counter32, Gauge32, and TimeTicks are encoded as 4
         contiguous bytes, according to the header's
@@ -284,47 +267,28 @@ class ValueRepresentation(namedtuple('_ValueRepresentation', ('type_', 'reserved
 
         :param type_: type integer
         :param byte_string:  byte stream
+        :param offset: position of the value data within byte_string
+        :return: tuple(data, size of the encoded data)
         """
-        typed_bind = constants.ValueType(type_)
-        if typed_bind in cls.FOUR_BYTE_TYPES:
-            data = struct.unpack(endianness + 'L', byte_string[:4])[0]
-            size = 4
-        elif typed_bind == constants.ValueType.COUNTER_64:
-            data = struct.unpack(endianness + 'Q', byte_string[:8])[0]
-            size = 8
-        elif typed_bind == constants.ValueType.OBJECT_IDENTIFIER:
-            data = ObjectIdentifier.from_bytes(byte_string, endianness)
-            size = data.size
-        elif typed_bind in cls.OCTET_STRINGS:
-            data = OctetString.from_bytes(byte_string, endianness)
-            size = data.size
-        elif typed_bind in cls.EMPTY_TYPES:
-            data = None
-            size = 0
-        else:
-            raise ValueError("Unknown bound type.")
-
-        return data, size
+        return _value_codec(type_).decode(byte_string, endianness, offset)
 
     def to_bytes(self, endianness):
-        fmt = endianness + 'HH'
-        byte_string = struct.pack(fmt, self.type_, self.reserved)
-        byte_string += self.name.to_bytes(endianness)
-
-        typed_bind = constants.ValueType(self.type_)
-        if typed_bind in self.FOUR_BYTE_TYPES:
-            byte_string += struct.pack(endianness + 'L', self.data)
-        elif typed_bind == constants.ValueType.COUNTER_64:
-            byte_string += struct.pack(endianness + 'Q', self.data)
-        elif typed_bind == constants.ValueType.OBJECT_IDENTIFIER or typed_bind in self.OCTET_STRINGS:
-            byte_string += self.data.to_bytes(endianness)
-        elif typed_bind in self.EMPTY_TYPES:
-            # ret += b''
-            pass
-        return byte_string
+        buffer = bytearray(self.size)
+        self.pack_into(buffer, 0, endianness)
+        return bytes(buffer)
+
+    def pack_into(self, buffer, offset, endianness):
+        """
+        Encodes the VarBind into a writable buffer (e.g. a preallocated response PDU).
+
+        :return: the offset immediately following the VarBind.
+        """
+        codec.VARBIND_HEADER[endianness].pack_into(buffer, offset, self.type_, self.reserved)
+        offset = self.name.pack_into(buffer, offset + 4, endianness)
+        return _value_codec(self.type_).encode(buffer, offset, endianness, self.data)
 
     @classmethod
-    def from_bytes(cls, byte_string, endianness):
+    def from_bytes(cls, byte_string, endianness, offset=0):
         """
         VarBind
 
@@ -350,13 +314,116 @@ class ValueRepresentation(namedtuple('_ValueRepresentation', ('type_', 'reserved
         |                       data                                    |
         +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
-        :param byte_string: Stream of bytes from which to unpack the VR
+        :param byte_string: Stream of bytes (or buffer view) from which to unpack the VR
         :param endianness: big/little endian format specifier.
+        :param offset: position of the VarBind within byte_string
         :return: an instance of ValueRepresentation.
         """
-        type_, reserved = struct.unpack(endianness + 'HH', byte_string[:4])
-        name = ObjectIdentifier.from_bytes(byte_string[4:], endianness)
-        offset = 4 + name.size
-        data, offset = cls._unpack_data(type_, byte_string[offset:], endianness)
-        vr = cls(constants.ValueType(type_), reserved, name, data)
+        type_, reserved = codec.VARBIND_HEADER[endianness].unpack_from(byte_string, offset)
+        name = ObjectIdentifier.from_bytes(byte_string, endianness, offset + 4)
+        value_codec = _value_codec(type_)
+        data, _ = value_codec.decode(byte_string, endianness, offset + 4 + name.size)
+        vr = cls(value_codec.value_type, reserved, name, data)
         return vr
+
+
+class EncodedValueRepresentation(ValueRepresentation):
+    """
+    A ValueRepresentation that keeps its encoding in each byte order, so a VarBind served repeatedly (e.g. between
+    two updates of the data behind it) is encoded once and copied into every subsequent response.
+    """
+
+    @property
+    def size(self):
+        encoded = vars(self).get('encoded')
+        if encoded:
+            return len(next(iter(encoded.values())))
+        return super().size
+
+    def pack_into(self, buffer, offset, endianness):
+        encoded = vars(self).setdefault('encoded', {})
+        varbind = encoded.get(endianness)
+        if varbind is None:
+            varbind = bytearray(super().size)
+            super().pack_into(varbind, 0, endianness)
+            varbind = encoded[endianness] = bytes(varbind)
+        end = offset + len(varbind)
+        buffer[offset:end] = varbind
+        return end
+
+
+class _ValueCodec(namedtuple('_ValueCodec', ('value_type', 'encode', 'size', 'decode', 'cast'))):
+    """
+    Per-type handlers for the value data of a VarBind:
+
+    - encode(buffer, offset, endianness, data) -> offset following the data
+    - size(data) -> encoded size of the data
+    - decode(byte_string, endianness, offset) -> (data, encoded size of the data)
+    - cast(data) -> data in its encodable form (see ValueRepresentation.from_typecast)
+    """
+    __slots__ = ()
+
+
+def _encode_four_bytes(buffer, offset, endianness, data):
+    codec.UINT32[endianness].pack_into(buffer, offset, data)
+    return offset + 4
+
+
+def _decode_four_bytes(byte_string, endianness, offset):
+    return codec.UINT32[endianness].unpack_from(byte_string, offset)[0], 4
+
+
+def _encode_eight_bytes(buffer, offset, endianness, data):
+    codec.UINT64[endianness].pack_into(buffer, offset, data)
+    return offset + 8
+
+
+def _decode_eight_bytes(byte_string, endianness, offset):
+    return codec.UINT64[endianness].unpack_from(byte_string, offset)[0], 8
+
+
+def _encode_encoding(buffer, offset, endianness, data):
+    return data.pack_into(buffer, offset, endianness)
+
+
+def _decode_oid(byte_string, endianness, offset):
+    data = ObjectIdentifier.from_bytes(byte_string, endianness, offset)
+    return data, data.size
+
+
+def _decode_octet_string(byte_string, endianness, offset):
+    data = OctetString.from_bytes(byte_string, endianness, offset)
+    return data, data.size
+
+
+def _cast_oid(data):
+    return ObjectIdentifier.from_iterable(data) if type(data) is not ObjectIdentifier else data
+
+
+def _value_codec_table():
+    table = {}
+    for value_type in ValueRepresentation.FOUR_BYTE_TYPES:
+        table[value_type] = _ValueCodec(value_type, _encode_four_bytes, lambda data: 4, _decode_four_bytes,
+                                        lambda data: data)
+    table[constants.ValueType.COUNTER_64] = _ValueCodec(
+        constants.ValueType.COUNTER_64, _encode_eight_bytes, lambda data: 8, _decode_eight_bytes, lambda data: data)
+    table[constants.ValueType.OBJECT_IDENTIFIER] = _ValueCodec(
+        constants.ValueType.OBJECT_IDENTIFIER, _encode_encoding, lambda data: data.size, _decode_oid, _cast_oid)
+    for value_type in ValueRepresentation.OCTET_STRINGS:
+        table[value_type] = _ValueCodec(value_type, _encode_encoding, lambda data: data.size, _decode_octet_string,
+                                        OctetString.from_string)
+    for value_type in ValueRepresentation.EMPTY_TYPES:
+        table[value_type] = _ValueCodec(value_type, lambda buffer, offset, endianness, data: offset, lambda data: 0,
+                                        lambda byte_string, endianness, offset: (None, 0), lambda data: None)
+    # key on the raw type integer, so the per-varbind path never constructs a ValueType
+    return {int(value_type): value_codec for value_type, value_codec in table.items()}
+
+
+_VALUE_CODECS = _value_codec_table()
+
+
+def _value_codec(type_):
+    try:
+        return _VALUE_CODECS[type_]
+    except KeyError:
+        raise ValueError("Unknown bound type.")
@@ -1,14 +1,17 @@
 import sys
+import copy
+import time
 import asyncio
 import bisect
-import random
 import logging
+from collections import OrderedDict
 
 from . import util
 from . import logger
 
 from .constants import ValueType
-from .encodings import ValueRepresentation
+from .encodings import ValueRepresentation, EncodedValueRepresentation
+from .scheduler import UpdateScheduler
 
 """
 Update interval between update runs (in seconds).
@@ -20,36 +23,142 @@ Interval between reinit runs (in seconds).
 """
 DEFAULT_REINIT_RATE = 60
 
+"""
+Number of suspended GetNext walks kept by a MIBTable (see MIBTable.get_next).
+"""
+WALK_CURSOR_CACHE_SIZE = 128
+
 class MIBUpdater:
     """
     Interface for developing OID handlers that require persistent (or background) execution.
     """
 
     def __init__(self):
-        self.run_event = asyncio.Event()
         self.frequency = DEFAULT_UPDATE_FREQUENCY
         self.update_counter = 0
         self.reinit_rate = DEFAULT_REINIT_RATE // DEFAULT_UPDATE_FREQUENCY
+        # incremented each time the updater refreshes its data.
+        self.generation = 0
+        # called with the updater at the end of each refresh.
+        self.refresh_callbacks = []
+        # concurrent.futures.Executor to run updates in, or None to run them on the event loop.
+        self.executor = None
+        # the updater goes dormant (stops refreshing) when not queried for 'idle_timeout' seconds. None never idles.
+        self.idle_timeout = None
+        self.last_access = time.monotonic()
+
+    async def run_once(self):
+        """
+        A single refresh: reinit_data() every 'reinit_rate' runs, update_data(), then refreshed().
+        """
+        # reinit internal structures
+        reinit = self.update_counter > self.reinit_rate
+        if reinit:
+            self.update_counter = 0
+        else:
+            self.update_counter += 1
 
-    async def start(self):
-        # Run the update while we are allowed
-        while self.run_event.is_set():
-            # reinit internal structures
-            if self.update_counter > self.reinit_rate:
+        if self.is_coroutine:
+            if reinit:
+                self.reinit_data()
+            # awaits its own I/O, on the loop.
+            await self._update_data_async()
+        elif self.executor is None:
+            if reinit:
                 self.reinit_data()
-                self.update_counter = 0
-            else:
-                self.update_counter += 1
             # run the background update task
-            try:
-                self.update_data()
-            except Exception:
-                # Any other exception or error, log it and keep running
-                logger.exception("MIBUpdater.start() caught an unexpected exception")
+            self._update_data()
+        else:
+            # build the new state in the worker pool, leaving the loop free to answer PDUs.
+            await self.update_off_loop(reinit)
+        self.refreshed()
+
+    def _update_data(self):
+        try:
+            self.update_data()
+        except Exception:
+            # Any other exception or error, log it and keep running
+            logger.exception("MIBUpdater.run_once() caught an unexpected exception")
+
+    async def _update_data_async(self):
+        try:
+            await self.update_data()
+        except Exception:
+            # Any other exception or error, log it and keep running
+            logger.exception("MIBUpdater.run_once() caught an unexpected exception")
+
+    @property
+    def is_coroutine(self):
+        """
+        True if update_data() is a coroutine function. Such updaters refresh on the event loop (never in the executor)
+        and are not seeded by their constructor.
+        """
+        return asyncio.iscoroutinefunction(self.update_data)
+
+    async def update_off_loop(self, reinit=False):
+        """
+        Runs reinit_data()/update_data() on a shallow copy of the updater in self.executor, then adopts the
+        attributes the copy rebound. Attributes rebound on the loop in the meantime (e.g. by accessed()) are kept
+        unless the copy rebound them too. Updaters must build new containers and rebind them rather than change the ones
+        they hold--the copy shares them with the updater answering requests in the meantime. Anything shared
+        between updaters (connections, caches) must be thread-safe: with several workers, updaters refresh
+        concurrently.
+
+        :param reinit: also run reinit_data() beforehand.
+        """
+        snapshot = copy.copy(self)
+        # what the copy started from: only what the worker rebinds is adopted, not what the loop rebinds meanwhile.
+        before = dict(vars(snapshot))
+
+        def update():
+            if reinit:
+                snapshot.reinit_data()
+            snapshot._update_data()
+
+        await asyncio.get_event_loop().run_in_executor(self.executor, update)
+
+        # swap in the new state, on the loop.
+        state = vars(self)
+        for name, value in vars(snapshot).items():
+            if before.get(name) is not value:
+                state[name] = value
+
+    @property
+    def dormant(self):
+        return self.idle_timeout is not None and time.monotonic() - self.last_access > self.idle_timeout
+
+    def accessed(self):
+        """
+        Records a query of the updater's data. A dormant updater is refreshed first, on the spot, so the query does
+        not see data from before it went dormant.
+
+        :return: True if the updater was woken up (and refreshed). Coroutine updaters (see is_coroutine) are refreshed
+        in the background instead, and False is returned.
+        """
+        woken = self.dormant
+        if woken:
+            logger.debug("Waking dormant updater '{}'".format(type(self).__name__))
+            if self.is_coroutine:
+                # cannot be awaited here--this query still sees the data from before it went dormant.
+                woken = False
+                asyncio.ensure_future(self._wake_async())
+            else:
+                self._update_data()
+                self.refreshed()
+        self.last_access = time.monotonic()
+        return woken
+
+    async def _wake_async(self):
+        await self._update_data_async()
+        self.refreshed()
 
-            # wait based on our update frequency before executing again.
-            # randomize to avoid concurrent update storms.
-            await asyncio.sleep(self.frequency + random.randint(-2, 2))
+    def refreshed(self):
+        """
+        Starts a new data generation and notifies the subscribers (see MIBTable).
+        """
+        self.generation += 1
+        for callback in self.refresh_callbacks:
+            callback(self)
 
     def reinit_data(self):
         """
@@ -182,11 +291,166 @@ class MIBEntry:
     def get_next(self, sub_id):
         return None
 
+class SortedIndex:
+    """
+    Sorted sequence of row sub-identifiers, together with a hash index of the same rows.
+    Membership tests are O(1) and successor search O(log n).
+    """
+
+    __slots__ = ('keys', 'members')
+
+    # most keys update() adds or removes one at a time.
+    BULK_UPDATE = 64
+
+    def __init__(self, keys=()):
+        """
+        :param keys: row sub-identifiers (hashable, comparable), in any order. Duplicates are dropped.
+        """
+        self.members = set(keys)
+        self.keys = sorted(self.members)
+
+    def __contains__(self, key):
+        return key in self.members
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        return self.keys[index]
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.keys)
+
+    def get_next(self, key):
+        """
+        :return: the first key strictly greater than 'key', or None.
+        """
+        right = bisect.bisect_right(self.keys, key)
+        if right == len(self.keys):
+            return None
+        return self.keys[right]
+
+    def add(self, key):
+        if key not in self.members:
+            self.members.add(key)
+            bisect.insort(self.keys, key)
+
+    def discard(self, key):
+        if key in self.members:
+            self.members.remove(key)
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def copy(self):
+        """
+        :return: an independent index with the same keys.
+        """
+        index = copy.copy(self)
+        index.keys = list(self.keys)
+        index.members = set(self.members)
+        return index
+
+    def update(self, added=(), removed=()):
+        """
+        Adds and removes keys in bulk. A few keys are inserted (deleted) one at a time; past BULK_UPDATE keys, the
+        sequence is rebuilt in a single pass instead. Either way, readers (on other threads) see a consistent sequence.
+        """
+        added = set(added).difference(self.members)
+        removed = set(removed).intersection(self.members)
+        if len(added) + len(removed) <= self.BULK_UPDATE:
+            for key in removed:
+                self.discard(key)
+            for key in added:
+                self.add(key)
+            return
+
+        keys = self.keys
+        if removed:
+            keys = [key for key in keys if key not in removed]
+        # the kept keys are one sorted run: merged, rather than sorted again.
+        keys = sorted(keys + sorted(added))
+        self.members.difference_update(removed)
+        self.members.update(added)
+        self.keys = keys
+
+
+class PackedIndex(SortedIndex):
+    """
+    SortedIndex of rows whose sub-identifiers all fit in an octet (e.g. IPv4 addresses), 'length' sub-ids each. Keys
+    are stored packed as bytes--a fraction of the memory of tuples, for the same order--but are given and returned as
+    tuples.
+    """
+
+    __slots__ = ('length',)
+
+    def __init__(self, length, keys=()):
+        """
+        :param length: number of sub-ids in a row.
+        :param keys: rows, in any order. Duplicates are dropped.
+        """
+        self.length = length
+        super().__init__(bytes(key) for key in keys)
+
+    def _pack(self, key):
+        """
+        :return: the packed key, or None if 'key' cannot be a row.
+        """
+        if len(key) != self.length or not all(0 <= sub_id <= 0xff for sub_id in key):
+            return None
+        return bytes(key)
+
+    def __contains__(self, key):
+        return self._pack(key) in self.members
+
+    def __iter__(self):
+        return (tuple(key) for key in self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [tuple(key) for key in self.keys[index]]
+        return tuple(self.keys[index])
+
+    def __repr__(self):
+        return '{}({}, {!r})'.format(type(self).__name__, self.length, list(self))
+
+    def get_next(self, key):
+        """
+        :param key: any sub-id tuple (not necessarily a row).
+        :return: the first row strictly greater than 'key', or None.
+        """
+        key = tuple(key[:self.length])
+        for position, sub_id in enumerate(key):
+            if sub_id > 0xff:
+                # no row starts with key[:position + 1]: skip past every row starting with key[:position].
+                packed = bytes(key[:position]) + b'\xff' * (self.length - position)
+                break
+        else:
+            # a prefix sorts before its extensions, as with tuples.
+            packed = bytes(key)
+        right = bisect.bisect_right(self.keys, packed)
+        if right == len(self.keys):
+            return None
+        return tuple(self.keys[right])
+
+    def add(self, key):
+        super().add(bytes(key))
+
+    def discard(self, key):
+        packed = self._pack(key)
+        if packed is not None:
+            super().discard(packed)
+
+    def update(self, added=(), removed=()):
+        removed = (self._pack(key) for key in removed)
+        super().update((bytes(key) for key in added), (packed for packed in removed if packed is not None))
+
+
 class ContextualMIBEntry(MIBEntry):
     def __init__(self, subtree, sub_ids, value_type, callable_, *args, updater=None):
         super().__init__(subtree, value_type, callable_, *args)
-        self.sub_ids = sorted(list(sub_ids))
-        self.sub_ids = [(i,) for i in self.sub_ids]
+        self.sub_ids = SortedIndex((i,) for i in sub_ids)
 
     def __iter__(self):
         for sub_id in self.sub_ids:
@@ -198,10 +462,7 @@ class ContextualMIBEntry(MIBEntry):
         return self._callable_.__call__(sub_id[0], *self._callable_args)
 
     def get_next(self, sub_id):
-        right = bisect.bisect_right(self.sub_ids, sub_id)
-        if right == len(self.sub_ids):
-            return None
-        return self.sub_ids[right]
+        return self.sub_ids.get_next(sub_id)
 
 class SubtreeMIBEntry(MIBEntry):
     def __init__(self, subtree, iterator, value_type, callable_, *args, updater=None):
@@ -224,18 +485,261 @@ class SubtreeMIBEntry(MIBEntry):
         return self.iterator.get_next(sub_id)
 
 
+class PrefixIndex:
+    """
+    Sorted index of registered OID prefixes, with a link from each prefix to its longest registered parent.
+    Supports longest-prefix match in O(log P + depth) and successor search in O(log P).
+    """
+
+    def __init__(self, prefixes):
+        self.oids = sorted(set(prefixes))
+        # index of the longest proper prefix of each OID, or -1 if it has none.
+        self.parents = []
+        ancestors = []
+        for oid in self.oids:
+            while ancestors and oid[:len(self.oids[ancestors[-1]])] != self.oids[ancestors[-1]]:
+                ancestors.pop()
+            self.parents.append(ancestors[-1] if ancestors else -1)
+            ancestors.append(len(self.parents) - 1)
+
+    def __len__(self):
+        return len(self.oids)
+
+    def find_parent(self, oid_key):
+        """
+        :param oid_key: OID tuple.
+        :return: the longest registered prefix of 'oid_key' (possibly 'oid_key' itself), or None.
+        """
+        # every prefix of 'oid_key' sorts before it, and is a prefix of its closest registered predecessor.
+        index = bisect.bisect_right(self.oids, oid_key) - 1
+        while index >= 0:
+            prefix = self.oids[index]
+            if oid_key[:len(prefix)] == prefix:
+                return prefix
+            index = self.parents[index]
+        return None
+
+    def successor_index(self, oid_key):
+        """
+        :param oid_key: OID tuple.
+        :return: the index of the first registered prefix strictly following 'oid_key'.
+        """
+        return bisect.bisect_right(self.oids, oid_key)
+
+
+class VarBindCache(dict):
+    """
+    OID tuple -> EncodedValueRepresentation, for a single updater generation.
+    """
+
+    def __init__(self, generation):
+        super().__init__()
+        self.generation = generation
+
+
+class MaterializedView:
+    """
+    Flat, sorted snapshot of the variables instantiated by an updater's subtrees, built from a single updater
+    generation. Lookups are a bisect; walking is an index increment.
+    """
+
+    def __init__(self, generation, subtrees):
+        """
+        :param generation: the updater generation the view is built from.
+        :param subtrees: iterable of (prefix, SubtreeMIBEntry) tuples enumerated by the updater.
+        """
+        self.generation = generation
+        self.oids = []
+        self.values = []
+        cache = VarBindCache(generation)
+        for prefix, mib_entry in sorted(subtrees, key=lambda subtree: subtree[0]):
+            for vr in MIBTable._walk_entry(mib_entry, prefix, iter(mib_entry), cache):
+                self.oids.append(vr.name.to_tuple())
+                self.values.append(vr)
+
+    def __len__(self):
+        return len(self.oids)
+
+    def find(self, oid_key):
+        """
+        :return: the ValueRepresentation named 'oid_key', or None.
+        """
+        index = bisect.bisect_left(self.oids, oid_key)
+        if index < len(self.oids) and self.oids[index] == oid_key:
+            return self.values[index]
+        return None
+
+    def iter_from(self, oid_key, include, prefix):
+        """
+        Yields the ValueRepresentations following (or, if 'include' is set, starting at) 'oid_key' within 'prefix'.
+        """
+        if include:
+            index = bisect.bisect_left(self.oids, oid_key)
+        else:
+            index = bisect.bisect_right(self.oids, oid_key)
+        prefix_len = len(prefix)
+        while index < len(self.oids) and self.oids[index][:prefix_len] == prefix:
+            yield self.values[index]
+            index += 1
+
+
 class MIBTable(dict):
     """
     Simplistic LUT for Get/GetNext OID. Interprets iterables as keys and implements the same interfaces as dict's.
+
+    With 'materialize' set, the subtrees enumerated by each updater are served from a MaterializedView, rebuilt
+    every time the updater refreshes. With an 'executor', updaters refresh in that pool (see
+    MIBUpdater.update_off_loop). With an 'idle_timeout', the updaters behind subtrees nobody queried for that long
+    stop refreshing until the next query (see MIBUpdater.accessed).
     """
 
-    def __init__(self, mib_cls, update_frequency=DEFAULT_UPDATE_FREQUENCY):
+    def __init__(self, mib_cls, update_frequency=DEFAULT_UPDATE_FREQUENCY, materialize=False, executor=None,
+                 update_intervals=None, idle_timeout=None):
         if type(mib_cls) is not MIBMeta:
             raise ValueError("Supplied object is not a MIB class instance.")
         super().__init__(getattr(mib_cls, MIBMeta.KEYSTORE))
         self.update_frequency = update_frequency
+        # updater class name -> refresh interval (in seconds), overriding 'update_frequency'.
+        self.update_intervals = update_intervals or {}
+        self.materialize = materialize
+        self.executor = executor
+        # idle window (in seconds) after which updaters of unqueried subtrees go dormant. None keeps them refreshing.
+        self.idle_timeout = idle_timeout
         self.updater_instances = getattr(mib_cls, MIBMeta.UPDATERS)
         self.prefixes = getattr(mib_cls, MIBMeta.PREFIXES)
+        for updater in self.updater_instances:
+            updater.refresh_callbacks.append(self._updater_refreshed)
+        # GetNext cursor statistics.
+        self.cursor_hits = 0
+        self.cursor_misses = 0
+
+    @property
+    def prefixes(self):
+        return self._prefixes
+
+    @prefixes.setter
+    def prefixes(self, prefixes):
+        # registrations changed--rebuild the lookup index.
+        self._prefixes = prefixes
+        self._prefix_index = PrefixIndex(prefixes)
+        # bitmap over the prefix index: bit i is set if the subtree at self._prefix_index.oids[i] has any sub_id.
+        self._populated = 0
+        # prefix indices of the subtrees enumerated by each updater.
+        self._updater_subtrees = {}
+        # updater -> MaterializedView. Replaced as a whole, never modified in place.
+        self._views = {}
+        # updater -> VarBindCache of its current generation.
+        self._varbind_caches = {}
+        # (session_id, last returned OID, end OID) -> (suspended walk, updater of the subtree it is in or None), least
+        # recently used first.
+        self._walk_cursors = OrderedDict()
+        for index, oid_key in enumerate(self._prefix_index.oids):
+            mib_entry = super().get(oid_key)
+            if type(mib_entry) is SubtreeMIBEntry and isinstance(mib_entry.iterator, MIBUpdater):
+                self._updater_subtrees.setdefault(mib_entry.iterator, []).append(index)
+            elif mib_entry is None or next(iter(mib_entry), None) is not None:
+                self._populated |= 1 << index
+        # bitmap of the subtrees enumerated by each updater.
+        self._updater_masks = {}
+        for updater, indices in self._updater_subtrees.items():
+            self._updater_masks[updater] = sum(1 << index for index in indices)
+            self._updater_refreshed(updater)
+
+    def _updater_refreshed(self, updater):
+        """
+        Recomputes the non-empty subtree bits of the subtrees enumerated by 'updater' and, if enabled, its
+        materialized view.
+        """
+        # walks suspended in its subtrees belong to the previous generation. The others pick up the new one when they
+        # get there (see walk()).
+        stale = [key for key, (_, owner) in self._walk_cursors.items() if owner is updater]
+        for key in stale:
+            del self._walk_cursors[key]
+        populated = updater.get_next(()) is not None
+        for index in self._updater_subtrees.get(updater, ()):
+            if populated:
+                self._populated |= 1 << index
+            else:
+                self._populated &= ~(1 << index)
+
+        if self.materialize and updater in self._updater_subtrees:
+            views = dict(self._views)
+            try:
+                oid_list = self._prefix_index.oids
+                views[updater] = MaterializedView(
+                    updater.generation,
+                    ((oid_list[index], super(MIBTable, self).get(oid_list[index]))
+                     for index in self._updater_subtrees[updater])
+                )
+            except Exception:
+                # fall back to querying the updater directly.
+                logger.exception("MIBTable failed to materialize the view of {}".format(updater))
+                views.pop(updater, None)
+            # swap in the new generation.
+            self._views = views
+
+    def _varbind_cache(self, mib_entry):
+        """
+        :return: the VarBindCache for the current generation of the updater behind 'mib_entry', or None.
+        """
+        if type(mib_entry) is not SubtreeMIBEntry or mib_entry.iterator not in self._updater_subtrees:
+            return None
+        updater = mib_entry.iterator
+        cache = self._varbind_caches.get(updater)
+        if cache is None or cache.generation != updater.generation:
+            cache = self._varbind_caches[updater] = VarBindCache(updater.generation)
+        return cache
+
+    def _accessed(self, mib_entry):
+        """
+        Lets the updater behind 'mib_entry' (if any) know it is being queried.
+
+        :return: True if that woke the updater up.
+        """
+        if type(mib_entry) is SubtreeMIBEntry and mib_entry.iterator in self._updater_subtrees:
+            return mib_entry.iterator.accessed()
+        return False
+
+    def _updater_of(self, oid_key):
+        """
+        :return: the updater enumerating the subtree 'oid_key' is in, or None.
+        """
+        prefix = self._find_parent_prefix(oid_key)
+        mib_entry = super().get(prefix) if prefix is not None else None
+        if type(mib_entry) is SubtreeMIBEntry and mib_entry.iterator in self._updater_subtrees:
+            return mib_entry.iterator
+        return None
+
+    @staticmethod
+    def _view_of(mib_entry, views):
+        """
+        :return: the MaterializedView serving 'mib_entry', or None.
+        """
+        if type(mib_entry) is SubtreeMIBEntry:
+            return views.get(mib_entry.iterator)
+        return None
+
+    def _scan_bitmap(self):
+        """
+        :return: the subtrees a walk should visit: the non-empty ones, plus those of dormant updaters--whose
+                 emptiness is unknown until they are woken up.
+        """
+        bitmap = self._populated
+        if self.idle_timeout is not None:
+            for updater, mask in self._updater_masks.items():
+                if updater.dormant:
+                    bitmap |= mask
+        return bitmap
+
+    @staticmethod
+    def _next_populated(bitmap, index):
+        """
+        :return: the first prefix index at or after 'index' set in 'bitmap', or None.
+        """
+        remaining = bitmap >> index
+        if not remaining:
+            return None
+        return index + (remaining & -remaining).bit_length() - 1
 
     def _done_background_task_callback(fut):
         ex = fut.exception()
@@ -244,51 +748,67 @@ class MIBTable(dict):
             logger.error(exstr)
 
     def start_background_tasks(self, event):
-        tasks = []
         for updater in self.updater_instances:
-            updater.frequency = self.update_frequency
-            updater.run_event = event
-            fut = asyncio.ensure_future(updater.start())
-            fut.add_done_callback(MIBTable._done_background_task_callback)
-            task = event._loop.create_task(fut)
-            tasks.append(task)
-        return asyncio.gather(*tasks, loop=event._loop)
+            updater.executor = self.executor
+            if updater in self._updater_subtrees:
+                # only the updaters whose queries this table sees may idle.
+                updater.idle_timeout = self.idle_timeout
+        scheduler = UpdateScheduler(self.updater_instances, self.update_frequency, self.update_intervals,
+                                    DEFAULT_REINIT_RATE)
+        task = event._loop.create_task(scheduler.run(event))
+        task.add_done_callback(MIBTable._done_background_task_callback)
+        return task
 
     def _find_parent_prefix(self, item):
-        oids = sorted(self.prefixes)
-        left_insert_index = bisect.bisect(oids, item)
-        preceding_oids = oids[:left_insert_index]
-        if not preceding_oids:
-            return None
-        if preceding_oids[-1] == item[:len(preceding_oids[-1])]:
-            return preceding_oids[-1]
-        else:
-            return None
+        return self._prefix_index.find_parent(item)
 
     def _find_parent_oid_key(self, oid_key):
         oids = sorted(self)
 
     def _get_value(self, mib_entry, oid_key):
+        cache = self._varbind_cache(mib_entry)
+        if cache is not None and oid_key in cache:
+            return cache[oid_key]
         sub_id = mib_entry.get_sub_id(oid_key)
         oid_value = mib_entry(sub_id)
         if oid_value is None:
             return None
         # OID found, call the OIDEntry
-        vr = ValueRepresentation.from_typecast(mib_entry.value_type, oid_key, oid_value)
+        if cache is None:
+            return ValueRepresentation.from_typecast(mib_entry.value_type, oid_key, oid_value)
+        vr = cache[oid_key] = EncodedValueRepresentation.from_typecast(mib_entry.value_type, oid_key, oid_value)
         return vr
 
-    def _get_nextvalue(self, mib_entry, oid_key):
-        sub_id = mib_entry.get_sub_id(oid_key)
-        key1 = mib_entry.get_next(sub_id)
-        if key1 is None:
-            return None
-        val1 = mib_entry(key1)
-        if val1 is None:
-            return None
-        oid1 = mib_entry.replace_sub_id(oid_key, key1)
-        # OID found, call the OIDEntry
-        vr = ValueRepresentation.from_typecast(mib_entry.value_type, oid1, val1)
-        return vr
+    @staticmethod
+    def _sub_ids_after(mib_entry, sub_id):
+        """
+        Yields the sub_ids of 'mib_entry' that follow 'sub_id', in order.
+        """
+        sub_id = mib_entry.get_next(sub_id)
+        while sub_id is not None:
+            yield sub_id
+            sub_id = mib_entry.get_next(sub_id)
+
+    @staticmethod
+    def _walk_entry(mib_entry, oid_key, sub_ids, cache=None):
+        """
+        Yields a ValueRepresentation for each of 'sub_ids' instantiated by 'mib_entry'. If a VarBindCache is given,
+        VarBinds are looked up there first and stored as EncodedValueRepresentation.
+        """
+        for sub_id in sub_ids:
+            oid = mib_entry.replace_sub_id(oid_key, sub_id)
+            if cache is not None and oid in cache:
+                yield cache[oid]
+                continue
+            value = mib_entry(sub_id)
+            if value is None:
+                # no data for this instance, keep walking.
+                continue
+            if cache is None:
+                yield ValueRepresentation.from_typecast(mib_entry.value_type, oid, value)
+            else:
+                vr = cache[oid] = EncodedValueRepresentation.from_typecast(mib_entry.value_type, oid, value)
+                yield vr
 
     def get(self, sr, d=None):
         oid_key = sr.start.to_tuple()
@@ -297,7 +817,12 @@ class MIBTable(dict):
         prefix = self._find_parent_prefix(oid_key)
         if prefix is not None:
             parent_mib_entry = super().get(prefix)
-            vr = self._get_value(parent_mib_entry, oid_key)
+            self._accessed(parent_mib_entry)
+            view = self._view_of(parent_mib_entry, self._views)
+            if view is not None:
+                vr = view.find(oid_key)
+            else:
+                vr = self._get_value(parent_mib_entry, oid_key)
             if vr is not None:
                 return vr
             # we found a prefix. E.g. (1,2,3) is a prefix to OID (1,2,3,1)
@@ -314,56 +839,93 @@ class MIBTable(dict):
         )
         return vr
 
-    def get_next(self, sr):
+    def walk(self, sr):
+        """
+        Walks the MIB view in lexicographic order, starting from the SearchRange 'sr' (see get_next).
+
+        Each step resumes from the subtree and sub_id of the previous one, so successive variables are produced
+        without repeating the prefix search.
+
+        :param sr: SearchRange to start from.
+        :return: generator of ValueRepresentation.
+        """
         start_key = sr.start.to_tuple()
         end_key = sr.end.to_tuple()
-        oid_list = sorted(self.prefixes)
+        oid_list = self._prefix_index.oids
 
         # find the best match prefix, either a exact match or a parent prefix
         prefix = self._find_parent_prefix(start_key)
+        view = None
         if prefix is not None:
             parent_mib_entry = super().get(prefix)
+            self._accessed(parent_mib_entry)
+        # the views as of the start of the walk.
+        views = self._views
+        if prefix is not None:
+            view = self._view_of(parent_mib_entry, views)
 
+        if view is not None:
+            yield from view.iter_from(start_key, sr.start.include, prefix)
+        elif prefix is not None:
             if sr.start.include:
                 vr = self._get_value(parent_mib_entry, start_key)
                 if vr is not None:
-                    return vr
-
-            vr = self._get_nextvalue(parent_mib_entry, start_key)
-            if vr is not None:
-                return vr
-
-        # return the index of an insertion point immediately following any duplicate value (thereby excluding it)
-        sorted_start_index = bisect.bisect_right(oid_list, start_key)
-
-        # slice our MIB by the insertion point.
-        remaining_oids = oid_list[sorted_start_index:]
-
-        while remaining_oids and remaining_oids[0] < end_key:
-            # we found at least one remaining oid and the first entry in the remaining oid list
-            # is less than our end value--it's a match.
-            oid_key = remaining_oids[0]
+                    yield vr
+
+            sub_id = parent_mib_entry.get_sub_id(start_key)
+            yield from self._walk_entry(parent_mib_entry, start_key,
+                                        self._sub_ids_after(parent_mib_entry, sub_id),
+                                        self._varbind_cache(parent_mib_entry))
+
+        # skip straight to the populated subtrees. The walk may be suspended (see get_next) across refreshes: each
+        # subtree is entered with the bitmap and views as of then.
+        index = self._next_populated(self._scan_bitmap(), self._prefix_index.successor_index(start_key))
+        while index is not None:
+            oid_key = oid_list[index]
+            if end_key and oid_key >= end_key:
+                # the remaining subtrees are beyond the end of the search range.
+                return
             mib_entry = self[oid_key]
-            key1 = next(iter(mib_entry)) # get the first sub_id from the mib_etnry
-            if key1 is None:
-                # handler returned None, which implies there's no data, keep walking.
-                remaining_oids = remaining_oids[1:]
-                continue
+            self._accessed(mib_entry)
+            view = self._view_of(mib_entry, self._views)
+            if view is not None:
+                yield from view.iter_from(oid_key, True, oid_key)
+            else:
+                yield from self._walk_entry(mib_entry, oid_key, iter(mib_entry), self._varbind_cache(mib_entry))
+            index = self._next_populated(self._scan_bitmap(), index + 1)
 
-            val1 = mib_entry(key1)
-            if val1 is None:
-                logger.error('MIBTable.get_next found an invalid key: {}+{}'.format(mib_entry.subtree, key1))
-                remaining_oids = remaining_oids[1:]
-                continue
+    def get_next(self, sr, session_id=None):
+        """
+        GetNext for a single SearchRange. Walks are suspended after each answer; a subsequent request from the same
+        session, starting from the OID just returned, resumes the walk with a single step forward.
 
-            oid1 = mib_entry.replace_sub_id(oid_key, key1)
+        :param sr: SearchRange
+        :param session_id: h.sessionID of the request.
+        :return: ValueRepresentation
+        """
+        start_key = sr.start.to_tuple()
+        end_key = sr.end.to_tuple()
 
-            # found a concrete OID value--return it.
-            vr = ValueRepresentation.from_typecast(
-                mib_entry.value_type,
-                oid1,
-                val1
-            )
+        walk = None
+        if not sr.start.include:
+            walk, _ = self._walk_cursors.pop((session_id, start_key, end_key), (None, None))
+        if walk is not None:
+            prefix = self._find_parent_prefix(start_key)
+            if prefix is not None and self._accessed(super().get(prefix)):
+                # the data changed under the suspended walk.
+                walk = None
+        if walk is None:
+            self.cursor_misses += 1
+            walk = self.walk(sr)
+        else:
+            self.cursor_hits += 1
+
+        vr = next(walk, None)
+        if vr is not None:
+            name = vr.name.to_tuple()
+            self._walk_cursors[(session_id, name, end_key)] = (walk, self._updater_of(name))
+            if len(self._walk_cursors) > WALK_CURSOR_CACHE_SIZE:
+                self._walk_cursors.popitem(last=False)
             return vr
 
         # exhausted all remaining OID options--we're at the end of the MIB view.
@@ -374,6 +936,38 @@ class MIBTable(dict):
             None,  # null value
         )
 
+    def get_bulk(self, sr_list, non_repeaters, max_repetitions, session_id=None):
+        """
+        Yields the VarBinds of an agentx-GetBulk-PDU response, in order. The first 'non_repeaters' SearchRanges are
+        processed as GetNext; the remaining ones are walked in lockstep for up to 'max_repetitions' rows.
+
+        A repeater that runs off the end of the MIB view reports endOfMibView for the rest of the rows. Repetitions
+        stop early once every repeater has done so.
+
+        :param sr_list: the PDU's SearchRangeList.
+        :param non_repeaters: g.non_repeaters
+        :param max_repetitions: g.max_repetitions
+        :param session_id: h.sessionID of the request (see get_next).
+        :return: generator of ValueRepresentation.
+        """
+        for sr in sr_list[:non_repeaters]:
+            yield self.get_next(sr, session_id)
+
+        repeaters = sr_list[non_repeaters:]
+        walks = [self.walk(sr) for sr in repeaters]
+        names = [sr.start for sr in repeaters]
+        for _ in range(max_repetitions):
+            if not any(walks):
+                break
+            for i, walk in enumerate(walks):
+                vr = next(walk, None) if walk is not None else None
+                if vr is None:
+                    walks[i] = None
+                    vr = ValueRepresentation(ValueType.END_OF_MIB_VIEW, 0, names[i], None)
+                else:
+                    names[i] = vr.name
+                yield vr
+
     def __setitem__(self, key, value):
         if not hasattr(value, '__iter__'):
             raise ValueError("Invalid key '{}'. All keys must be iterable types.".format(key))
@@ -5,7 +5,7 @@ PDU object implementation per https://www.ietf.org/rfc/rfc2741.txt
 import struct
 from collections import namedtuple
 
-from . import constants, logger, exceptions
+from . import codec, constants, logger, exceptions
 from .constants import PduTypes
 from .encodings import OctetString
 
@@ -87,8 +87,8 @@ class PDUHeaderTags(namedtuple('_PDUHeaderTags', ('version', 'type_', 'flags', '
         return '!' if self.flag__network_byte_order else '<'
 
     @classmethod
-    def from_bytes(cls, byte_string):
-        return cls(*struct.unpack('!BBBB', byte_string[:4]))
+    def from_bytes(cls, byte_string, offset=0):
+        return cls(*codec.PDU_HEADER_TAGS.unpack_from(byte_string, offset))
 
 
 PDUIdentifiers = namedtuple('PDUIdentifiers', ('session_id', 'transaction_id', 'packet_id', 'payload_length'))
@@ -113,14 +113,19 @@ class PDUHeader(namedtuple('_PDUHeader', PDUHeaderTags._fields + PDUIdentifiers.
     __slots__ = ()
 
     def to_bytes(self):
-        ret = struct.pack('!BBBB', self.version, self.type_, self.flags, self.reserved)
-        fmt = self.endianness + 'LLLL'
-        ret += struct.pack(fmt, self.session_id, self.transaction_id, self.packet_id, self.payload_length)
-        return ret
+        buffer = bytearray(constants.AGENTX_HEADER_LENGTH)
+        self.pack_into(buffer, 0)
+        return bytes(buffer)
+
+    def pack_into(self, buffer, offset):
+        codec.PDU_HEADER_TAGS.pack_into(buffer, offset, self.version, self.type_, self.flags, self.reserved)
+        codec.PDU_HEADER_IDS[self.endianness].pack_into(buffer, offset + 4, self.session_id, self.transaction_id,
+                                                        self.packet_id, self.payload_length)
+        return offset + constants.AGENTX_HEADER_LENGTH
 
     @classmethod
-    def from_bytes(cls, byte_string):
-        pdu_info = PDUHeaderTags.from_bytes(byte_string)
+    def from_bytes(cls, byte_string, offset=0):
+        pdu_info = PDUHeaderTags.from_bytes(byte_string, offset)
         """
         Four remaining longs makeup the identifiers. Combine the two based on parsed flags.
 
@@ -132,7 +137,7 @@ class PDUHeader(namedtuple('_PDUHeader', PDUHeaderTags._fields + PDUIdentifiers.
             header = cls(
                 *pdu_info,
                 *PDUIdentifiers(
-                    *struct.unpack(pdu_info.endianness + '4L', byte_string[4:constants.AGENTX_HEADER_LENGTH])
+                    *codec.PDU_HEADER_IDS[pdu_info.endianness].unpack_from(byte_string, offset + 4)
                 )
             )
             return header
@@ -155,6 +160,71 @@ class RegisteredPDU(type):
         return cls
 
 
+class PDUFramer:
+    """
+    Reassembles the AgentX socket stream into complete PDU frames.
+
+    Bytes are buffered across reads until a full PDU (header + h.payload_length bytes) is available. Complete frames
+    are handed out as memoryviews over the received data, so decoding them never copies the underlying bytes.
+
+    A header announcing more than AGENTX_MAX_PAYLOAD_LENGTH bytes is rejected rather than buffered for: the stream
+    cannot be trusted past it.
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+
+    @staticmethod
+    def _frame_end(data, offset):
+        """
+        :return: the end offset of the PDU starting at 'offset', or None if the PDU is not yet complete.
+        """
+        if len(data) - offset < constants.AGENTX_HEADER_LENGTH:
+            return None
+        header = PDUHeader.from_bytes(data, offset)
+        if header.payload_length > constants.AGENTX_MAX_PAYLOAD_LENGTH:
+            raise exceptions.PDUUnpackError("PDU payload length {} exceeds {}.".format(
+                header.payload_length, constants.AGENTX_MAX_PAYLOAD_LENGTH))
+        end = offset + constants.AGENTX_HEADER_LENGTH + header.payload_length
+        return end if end <= len(data) else None
+
+    def feed(self, data):
+        """
+        :param data: Socket stream data (as byte string)
+        :return: list of complete PDU frames (as memoryview), in stream order.
+        :raises PDUUnpackError: a PDU header announces an oversized payload. Everything buffered is dropped; the
+                                stream should be reset.
+        """
+        try:
+            return self._feed(data)
+        except exceptions.PDUUnpackError:
+            self._pending = bytearray()
+            raise
+
+    def _feed(self, data):
+        if self._pending:
+            self._pending += data
+            if self._frame_end(self._pending, 0) is None:
+                # still waiting on the remainder of a split PDU
+                return []
+            data = bytes(self._pending)
+            self._pending = bytearray()
+
+        view = memoryview(data)
+        frames = []
+        offset = 0
+        end = self._frame_end(data, offset)
+        while end is not None:
+            frames.append(view[offset:end])
+            offset = end
+            end = self._frame_end(data, offset)
+
+        if offset < len(data):
+            # keep the partial PDU for the next read
+            self._pending += view[offset:]
+        return frames
+
+
 class PDUStream:
     """
     Contiguous PDU bytestream constructor.
@@ -164,11 +234,8 @@ class PDUStream:
         self.data = data
 
     def __iter__(self):
-        _data = self.data
-        while _data:
-            pdu = PDU.decode(_data)
-            yield pdu
-            _data = pdu._trailing_bytes
+        for frame in PDUFramer().feed(self.data):
+            yield PDU.decode(frame)
 
 
 class PDU(object, metaclass=RegisteredPDU):
@@ -189,7 +256,8 @@ class PDU(object, metaclass=RegisteredPDU):
             raise ValueError("Payload and PDU fields are mutually exclusive.")
 
         self.header = header._replace(type_=self.header_type_)
-        self._trailing_bytes = payload or b''
+        # payloads are consumed through a memoryview so that chomping decoded fields never copies the buffer.
+        self._trailing_bytes = memoryview(payload) if payload else b''
 
     def __str__(self):
         return str(self.__dict__)
@@ -211,26 +279,59 @@ class PDU(object, metaclass=RegisteredPDU):
 
         # based on the type field, find the appropriate class and instantiate it.
         try:
-            return supported_pdus[header.type_](
-                payload=byte_string[constants.AGENTX_HEADER_LENGTH:],
-                header=header)
+            pdu_cls = supported_pdus[header.type_]
         except KeyError:
             raise exceptions.UnsupportedPDUError("PDU Type [{}] is not supported".format(header.type_))
+
+        pdu_end = constants.AGENTX_HEADER_LENGTH + header.payload_length
+        if len(byte_string) < pdu_end:
+            raise exceptions.PDUUnpackError("PDU payload length is [{}], received [{}] bytes.".format(
+                header.payload_length,
+                len(byte_string) - constants.AGENTX_HEADER_LENGTH
+            ))
+
+        try:
+            return pdu_cls(
+                payload=memoryview(byte_string)[constants.AGENTX_HEADER_LENGTH:pdu_end],
+                header=header)
         except (struct.error, ValueError) as e:
             raise exceptions.PDUUnpackError("Failed to unpack PDU.", inner_exception=e)
 
     def encode(self):
+        """
+        Serializes the PDU in a single pass: the header and payload are written into one preallocated buffer and
+        h.payload_length is patched in once the payload has been written.
+
+        :return: the encoded PDU (as bytearray)
+        """
         try:
-            return self.header.to_bytes()
+            buffer = bytearray(constants.AGENTX_HEADER_LENGTH + self.payload_length)
+            end = self.encode_into(buffer, 0)
+            # back-patch h.payload_length (the last field of the header)
+            codec.UINT32[self.header.endianness].pack_into(buffer, constants.AGENTX_HEADER_LENGTH - 4,
+                                                           end - constants.AGENTX_HEADER_LENGTH)
+            return buffer
         except (struct.error, ValueError) as e:
             raise exceptions.PDUPackError("Failed to pack PDU.", inner_exception=e)
 
+    def encode_into(self, buffer, offset):
+        """
+        Writes the PDU into 'buffer' at 'offset'. Children with a payload extend this method.
+
+        :return: the offset immediately following the written bytes.
+        """
+        return self.header.pack_into(buffer, offset)
+
     def make_response(self, lut):
         raise NotImplementedError("Child PDUs must create response objects.")
 
     @property
     def payload_length(self):
-        return len(self.encode()) - constants.AGENTX_HEADER_LENGTH
+        """
+        Size of the encoded payload, computed from the PDU fields (without encoding). Children with a payload
+        extend this property.
+        """
+        return 0
 
 
 class ContextOptionalPDU(PDU):
@@ -250,11 +351,18 @@ class ContextOptionalPDU(PDU):
             # chomp the context block from unprocessed bytes
             self._trailing_bytes = self._trailing_bytes[self.context.size:]
 
-    def encode(self):
-        ret = super().encode()
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
+        if self.context is not None:
+            offset = self.context.pack_into(buffer, offset, self.header.endianness)
+        return offset
+
+    @property
+    def payload_length(self):
+        length = super().payload_length
         if self.context is not None:
-            ret += self.context.to_bytes(self.header.endianness)
-        return ret
+            length += self.context.size
+        return length
 
 
 # noinspection PyUnresolvedReferences
@@ -4,7 +4,7 @@ PDU Implementation classes.
 import struct
 from enum import Enum, unique
 
-from . import util, constants
+from . import codec, util, constants
 from .constants import PduTypes
 from .encodings import ObjectIdentifier, SearchRange, OctetString, ValueRepresentation
 from .pdu import PDU, ContextOptionalPDU
@@ -42,13 +42,16 @@ class OpenPDU(PDU):
 
             # end of object stream
 
-    def encode(self):
-        ret = super().encode()
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
         fmt = self.header.endianness + 'B3s'
-        ret += struct.pack(fmt, self.timeout, self.reserved)
-        ret += self.oid.to_bytes(self.header.endianness)
-        ret += self.descr.to_bytes(self.header.endianness)
-        return ret
+        struct.pack_into(fmt, buffer, offset, self.timeout, self.reserved)
+        offset = self.oid.pack_into(buffer, offset + 4, self.header.endianness)
+        return self.descr.pack_into(buffer, offset, self.header.endianness)
+
+    @property
+    def payload_length(self):
+        return super().payload_length + 4 + self.oid.size + self.descr.size
 
 
 class ClosePDU(PDU):
@@ -98,6 +101,15 @@ class ClosePDU(PDU):
         self.header = self.header._replace(payload_length=4)
         # end of object stream
 
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
+        struct.pack_into(self.header.endianness + 'B3s', buffer, offset, self.reason, self.reason_reserved)
+        return offset + 4
+
+    @property
+    def payload_length(self):
+        return super().payload_length + 4
+
 
 class RegisterPDU(ContextOptionalPDU):
     """
@@ -136,14 +148,22 @@ class RegisterPDU(ContextOptionalPDU):
             self.subtree, self.upper_bound = subtree, upper_bound
             self.header = self.header._replace(payload_length=self.payload_length)
 
-    def encode(self):
-        ret = super().encode()
-        ret += struct.pack(self.header.endianness + 'BBBB', self.timeout, self.priority, self.range_subid,
-                           self.range_subid_reserved)
-        ret += self.subtree.to_bytes(self.header.endianness)
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
+        struct.pack_into(self.header.endianness + 'BBBB', buffer, offset, self.timeout, self.priority,
+                         self.range_subid, self.range_subid_reserved)
+        offset = self.subtree.pack_into(buffer, offset + 4, self.header.endianness)
         if self.upper_bound is not None:
-            ret += struct.pack(self.header.endianness + 'L', self.upper_bound)
-        return ret
+            struct.pack_into(self.header.endianness + 'L', buffer, offset, self.upper_bound)
+            offset += 4
+        return offset
+
+    @property
+    def payload_length(self):
+        length = super().payload_length + 4 + self.subtree.size
+        if self.upper_bound is not None:
+            length += 4
+        return length
 
 
 # class UnRegisterPDU(OptionalContextPDU):
@@ -181,13 +201,17 @@ class GetPDU(ContextOptionalPDU):
                 self.sr.append(
                     SearchRange(start=oid, end=oid.inc())
                 )
-            self.header = self.header._replace(payload_length=len(self.encode()))
+            self.header = self.header._replace(payload_length=self.payload_length)
 
-    def encode(self):
-        ret = super().encode()
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
         for sr in self.sr:
-            ret += sr.to_bytes(self.header.endianness)
-        return ret
+            offset = sr.pack_into(buffer, offset, self.header.endianness)
+        return offset
+
+    @property
+    def payload_length(self):
+        return super().payload_length + sum(sr.size for sr in self.sr)
 
     def make_response(self, lut):
         """
@@ -286,7 +310,7 @@ class GetNextPDU(GetPDU):
         var_bind_list = []
 
         for sr in self.sr:
-            vr = lut.get_next(sr)
+            vr = lut.get_next(sr, self.header.session_id)
             var_bind_list.append(vr)
 
         response_pdu = ResponsePDU(
@@ -302,14 +326,107 @@ class GetNextPDU(GetPDU):
         return response_pdu
 
 
-# class GetBulkPDU(ContextOptionalPDU):
-#     """
-#     https://tools.ietf.org/html/rfc2741#section-6.2.7
-#     """
-# TODO: 'generr' on other failure
-#     header_type_ = PduTypes.GET_BULK
-# TODO: Implement.
+class GetBulkPDU(ContextOptionalPDU):
+    """
+    https://tools.ietf.org/html/rfc2741#section-6.2.7
+    """
+    header_type_ = PduTypes.GET_BULK
+
+    def __init__(self, header=None, payload=None, context=None, non_repeaters=0, max_repetitions=0, oids=None):
+        super().__init__(header=header, payload=payload, context=context)
+        self.sr = []
+
+        if payload is not None:
+            bulk_fields = codec.GET_BULK_FIELDS[self.header.endianness]
+            self.non_repeaters, self.max_repetitions = bulk_fields.unpack_from(self._trailing_bytes)
+            self._trailing_bytes = self._trailing_bytes[bulk_fields.size:]
+            # consume the remaining bytestream
+            while self._trailing_bytes:
+                # unpack the OID
+                search_oid = SearchRange.from_bytes(self._trailing_bytes, self.header.endianness)
+                # move the pointer
+                self._trailing_bytes = self._trailing_bytes[search_oid.size:]
+                # remember the OID
+                self.sr.append(search_oid)
+        else:
+            self.non_repeaters = non_repeaters
+            self.max_repetitions = max_repetitions
+            for oid in oids:
+                self.sr.append(
+                    SearchRange(start=oid, end=ObjectIdentifier.null_oid())
+                )
+            self.header = self.header._replace(payload_length=self.payload_length)
 
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
+        bulk_fields = codec.GET_BULK_FIELDS[self.header.endianness]
+        bulk_fields.pack_into(buffer, offset, self.non_repeaters, self.max_repetitions)
+        offset += bulk_fields.size
+        for sr in self.sr:
+            offset = sr.pack_into(buffer, offset, self.header.endianness)
+        return offset
+
+    @property
+    def payload_length(self):
+        return super().payload_length + codec.GET_BULK_FIELDS[self.header.endianness].size \
+               + sum(sr.size for sr in self.sr)
+
+    def make_response(self, lut):
+        """
+        From https://tools.ietf.org/html/rfc2741#section-7.2.3.3:
+
+           Upon the subagent's receipt of an agentx-GetBulk-PDU, it follows
+           the same procedures as for agentx-GetNext-PDU, except that the
+           processing is repeated for the SearchRanges following the first
+           g.non_repeaters of them, at most g.max_repetitions times.
+
+           [...]
+
+           Note that the subagent may terminate the repetitions early, for
+           instance because the response would be too large.
+
+        The response is capped at constants.SNMP_MAX_MSG_SIZE. The non-repeaters are always returned; repetitions
+        that would overflow the message are dropped, a whole repetition (one VarBind per repeater) at a time.
+
+        :param lut:
+        :return:
+        """
+
+        var_bind_list = []
+        response_size = constants.AGENTX_HEADER_LENGTH + codec.RESPONSE_FIELDS[self.header.endianness].size
+        non_repeaters = min(self.non_repeaters, len(self.sr))
+        repeaters = len(self.sr) - non_repeaters
+        repetition = []
+        repetition_size = 0
+
+        for i, vr in enumerate(lut.get_bulk(self.sr, self.non_repeaters, self.max_repetitions,
+                                            self.header.session_id)):
+            if i < non_repeaters:
+                var_bind_list.append(vr)
+                response_size += vr.size
+                continue
+            repetition.append(vr)
+            repetition_size += vr.size
+            if len(repetition) < repeaters:
+                continue
+            if response_size + repetition_size > constants.SNMP_MAX_MSG_SIZE:
+                break
+            var_bind_list.extend(repetition)
+            response_size += repetition_size
+            repetition = []
+            repetition_size = 0
+
+        response_pdu = ResponsePDU(
+            header=self.header._replace(
+                type_=constants.PduTypes.RESPONSE,
+            ),
+            sys_up_time=0,  # ignored for this PDU type.
+            error=ResponsePDU.Errors.NO_AGENT_X_ERROR,
+            index=0,
+            values=var_bind_list
+        )
+        # TODO: 'generr' on other failure
+        return response_pdu
 
 
 class TestSetPDU(ContextOptionalPDU):
@@ -478,8 +595,8 @@ class ResponsePDU(PDU):
         super().__init__(header=header, payload=payload)
 
         if payload is not None:
-            self.sys_up_time, self.error, self.index = struct.unpack(
-                self.header.endianness + 'LHH', self._trailing_bytes[:8])
+            self.sys_up_time, self.error, self.index = codec.RESPONSE_FIELDS[self.header.endianness].unpack_from(
+                self._trailing_bytes)
             self._trailing_bytes = self._trailing_bytes[8:]
 
             self.values = []
@@ -496,14 +613,18 @@ class ResponsePDU(PDU):
             self.values = list(values)
             self.header = self.header._replace(payload_length=self.payload_length)
 
-    def encode(self):
-        ret = super().encode()
-        fmt = self.header.endianness + 'LHH'
-        ret += struct.pack(fmt, self.sys_up_time, self.error, self.index)
-        if self.values:
-            for value in self.values:
-                ret += value.to_bytes(self.header.endianness)
-        return ret
+    def encode_into(self, buffer, offset):
+        offset = super().encode_into(buffer, offset)
+        codec.RESPONSE_FIELDS[self.header.endianness].pack_into(buffer, offset, self.sys_up_time, self.error,
+                                                                self.index)
+        offset += 8
+        for value in self.values:
+            offset = value.pack_into(buffer, offset, self.header.endianness)
+        return offset
+
+    @property
+    def payload_length(self):
+        return super().payload_length + 8 + sum(value.size for value in self.values)
 
     def make_response(self, lut):
         raise NotImplementedError(
@@ -2,7 +2,7 @@ import asyncio
 
 from . import logger, constants, exceptions
 from .encodings import ObjectIdentifier
-from .pdu import PDUHeader, PDUStream
+from .pdu import PDU, PDUHeader, PDUFramer
 from .pdu_implementations import RegisterPDU, ResponsePDU, OpenPDU
 
 
@@ -19,6 +19,8 @@ class AgentX(asyncio.Protocol):
         self.mib_table = mib_table
         self.closed = asyncio.Event(loop=loop)
         self.counter = 0
+        # reassembles PDUs split (or coalesced) across socket reads
+        self.framer = PDUFramer()
 
     def send_pdu(self, pdu):
         write_bytes = pdu.encode()
@@ -120,17 +122,28 @@ class AgentX(asyncio.Protocol):
           other reason the subagent cannot send a reply, processing is
           complete.
 
+        PDUs may be split across, or coalesced within, socket reads. Only complete PDUs are processed; any partial
+        PDU is buffered until the rest of it arrives.
+
         :param data: Socket stream data (as byte string)
         """
-        self.counter += 1
-        if not (self.counter % constants.REPORTING_FREQUENCY):
-            # Stayin' alive...Stayin' alive...
-            # Ahh, ahh, ahh, ahh
-            logger.debug("Parsed {} PDUs...".format(self.counter))
         try:
-            # each PDU type implements it's own subclass and will be inferred at construction.
-            pdu_stream = PDUStream(data)
-            for pdu in pdu_stream:
+            frames = self.framer.feed(data)
+        except exceptions.PDUUnpackError:
+            # out of sync with the master agent--start over on a new connection.
+            logger.exception("Invalid AgentX stream, closing the connection.")
+            self.transport.close()
+            return
+
+        for frame in frames:
+            self.counter += 1
+            if not (self.counter % constants.REPORTING_FREQUENCY):
+                # Stayin' alive...Stayin' alive...
+                # Ahh, ahh, ahh, ahh
+                logger.debug("Parsed {} PDUs...".format(self.counter))
+            try:
+                # each PDU type implements it's own subclass and will be inferred at construction.
+                pdu = PDU.decode(frame)
                 if isinstance(pdu, ResponsePDU):
                     # parse the response
                     self.parse_response(pdu)
@@ -138,12 +151,12 @@ class AgentX(asyncio.Protocol):
                     # a response will be returned if the current PDU warrants a response
                     response_pdu = pdu.make_response(self.mib_table)
                     self.transport.write(response_pdu.encode())
-        except exceptions.PDUUnpackError:
-            logger.exception('decode_error[{}]'.format(data))
-        except exceptions.PDUPackError:
-            logger.exception('encode_error[{}]'.format(data))
-        except Exception:
-            logger.exception("Uncaught AgentX proto error! [{}]".format(data))
+            except exceptions.PDUUnpackError:
+                logger.exception('decode_error[{}]'.format(bytes(frame)))
+            except exceptions.PDUPackError:
+                logger.exception('encode_error[{}]'.format(bytes(frame)))
+            except Exception:
+                logger.exception("Uncaught AgentX proto error! [{}]".format(bytes(frame)))
 
     def pause_writing(self):
         logger.warning("AgentX buffer above high-water mark. Suspending PDU processing.")
@@ -0,0 +1,107 @@
+"""
+Scheduling of the background MIBUpdater refreshes.
+"""
+
+import asyncio
+
+from . import logger
+
+"""
+Longest the scheduler sleeps (in seconds) before checking whether it should stop.
+"""
+SCHEDULER_TICK = 1
+
+
+class UpdateScheduler:
+    """
+    Refreshes each MIBUpdater on its own interval, from a single task.
+
+    Updaters are phased evenly across their interval (in class name order), so refreshes do not all land on the same
+    tick. Coroutine updaters that have not refreshed yet are due right away, since nothing else seeds them. Slots are
+    fixed: if an updater is still refreshing when its next slot comes up, the slot is skipped rather than queued
+    behind it. Dormant updaters (see MIBUpdater.accessed) are not refreshed.
+    """
+
+    def __init__(self, updaters, default_interval, intervals=None, reinit_interval=None):
+        """
+        :param updaters: MIBUpdater instances to schedule.
+        :param default_interval: refresh interval (in seconds) of updaters without an entry in 'intervals'.
+        :param intervals: updater class name -> refresh interval (in seconds).
+        :param reinit_interval: interval (in seconds) between reinit_data() runs. Unchanged if None.
+        """
+        self.updaters = sorted(updaters, key=lambda updater: type(updater).__name__)
+        self.default_interval = default_interval
+        self.intervals = intervals or {}
+        self.reinit_interval = reinit_interval
+        # number of slots skipped because the previous refresh overran.
+        self.skipped = 0
+
+    def interval(self, updater):
+        return self.intervals.get(type(updater).__name__, self.default_interval)
+
+    def schedule(self, now):
+        """
+        Applies the intervals to the updaters.
+
+        :param now: loop time of the first slot.
+        :return: dict of updater -> loop time of its first slot.
+        """
+        due = {}
+        for position, updater in enumerate(self.updaters):
+            interval = updater.frequency = self.interval(updater)
+            if self.reinit_interval is not None:
+                updater.reinit_rate = max(1, int(self.reinit_interval // interval))
+            if updater.is_coroutine and updater.generation == 0:
+                due[updater] = now
+            else:
+                due[updater] = now + interval * position / len(self.updaters)
+        return due
+
+    @staticmethod
+    def next_slot(due, now, interval):
+        """
+        :return: the first slot strictly after 'now', in phase with 'due'.
+        """
+        return due + ((now - due) // interval + 1) * interval
+
+    @staticmethod
+    def _done_refresh_callback(fut):
+        if fut.cancelled():
+            return
+        ex = fut.exception()
+        if ex is not None:
+            logger.error("UpdateScheduler refresh caught an unexpected exception: {}".format(str(ex)))
+
+    async def run(self, event):
+        """
+        Runs the refreshes while 'event' is set.
+        """
+        if not self.updaters:
+            return
+        loop = asyncio.get_event_loop()
+        due = self.schedule(loop.time())
+        running = {}
+        try:
+            while event.is_set():
+                now = loop.time()
+                for updater in self.updaters:
+                    if due[updater] > now:
+                        continue
+                    refresh = running.get(updater)
+                    if updater.dormant:
+                        # nobody is querying it--it will be refreshed on the next query instead.
+                        pass
+                    elif refresh is not None and not refresh.done():
+                        # the previous refresh overran its interval.
+                        self.skipped += 1
+                        logger.debug("UpdateScheduler skipped a refresh of '{}'".format(type(updater).__name__))
+                    else:
+                        refresh = running[updater] = asyncio.ensure_future(updater.run_once())
+                        refresh.add_done_callback(UpdateScheduler._done_refresh_callback)
+                    due[updater] = self.next_slot(due[updater], now, updater.frequency)
+
+                await asyncio.sleep(min(min(due.values()) - loop.time(), SCHEDULER_TICK))
+        finally:
+            pending = [refresh for refresh in running.values() if not refresh.done()]
+            if pending:
+                await asyncio.wait(pending)
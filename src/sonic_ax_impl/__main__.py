@@ -1,3 +1,5 @@
+import argparse
+import json
 import logging.handlers
 import os
 import shutil
@@ -21,6 +23,43 @@ def install_file(src_filename, dest_dir, executable=False):
         os.chmod(dest_file, st.st_mode | 0o111)
 
 
+def process_schedule_options():
+    """
+    Consumes the update schedule options from the command line, leaving the rest to swsssdk.
+
+    --update-schedule FILE          JSON object of updater class name -> update frequency (in seconds)
+    --update-interval NAME=SECONDS  update frequency of a single updater; may be repeated, overrides the file.
+    --update-idle-timeout SECONDS   stop refreshing tables not queried for that long; off by default, 0 too.
+    --materialize                   serve each updater's subtrees from a view rebuilt on every refresh.
+    --update-workers N              refresh the (non-coroutine) updaters in a pool of N threads; 0 (default) refreshes
+                                    them on the event loop.
+
+    :return: dict of keyword arguments for main(): update_intervals (updater class name -> update frequency, in
+    seconds), idle_timeout (or None), materialize and update_workers.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--update-schedule', metavar='FILE')
+    parser.add_argument('--update-interval', metavar='NAME=SECONDS', action='append', default=[])
+    parser.add_argument('--update-idle-timeout', metavar='SECONDS', type=float)
+    parser.add_argument('--materialize', action='store_true')
+    parser.add_argument('--update-workers', metavar='N', type=int, default=0)
+    options, sys.argv[1:] = parser.parse_known_args()
+
+    intervals = {}
+    if options.update_schedule is not None:
+        with open(options.update_schedule) as schedule_file:
+            intervals.update(json.load(schedule_file))
+    for interval in options.update_interval:
+        name, _, seconds = interval.partition('=')
+        intervals[name] = float(seconds)
+    return {
+        'update_intervals': intervals,
+        'idle_timeout': options.update_idle_timeout,
+        'materialize': options.materialize,
+        'update_workers': options.update_workers,
+    }
+
+
 def install_fragments():
     local_filepath = os.path.dirname(os.path.abspath(__file__))
     pass_script = os.path.join(local_filepath, 'bin/sysDescr_pass.py')
@@ -34,6 +73,7 @@ if __name__ == "__main__":
         sys.exit(0)
 
     # import command line arguments
+    schedule_options = process_schedule_options()
     args = swsssdk.util.process_options("sonic_ax_impl")
 
     # configure logging. If debug '-d' is specified, logs to stdout at designated level. syslog/INFO otherwise.
@@ -73,4 +113,4 @@ if __name__ == "__main__":
 
     from .main import main
 
-    main(update_frequency=args.get('update_frequency'))
+    main(update_frequency=args.get('update_frequency'), **schedule_options)
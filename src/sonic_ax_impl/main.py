@@ -9,6 +9,7 @@ import signal
 import sys
 
 import ax_interface
+from sonic_ax_impl import mibs
 from sonic_ax_impl.mibs import ieee802_1ab
 from . import logger
 from .mibs.ietf import rfc1213, rfc2863, rfc4292, rfc4363
@@ -17,6 +18,19 @@ from .mibs.vendor import dell
 # Background task update frequency ( in seconds )
 DEFAULT_UPDATE_FREQUENCY = 5
 
+# Per-updater update frequency ( in seconds ), by updater class name. Others use the update frequency.
+DEFAULT_UPDATE_INTERVALS = {
+    'LLDPUpdater': 30,
+    'RouteUpdater': 10,
+    'NextHopUpdater': 10,
+    'SystemUtilizationHandler': 5,
+}
+
+# Tables that are not queried for this long ( in seconds ) stop being refreshed until the next query. Off unless
+# --update-idle-timeout is given: the first query of a dormant table waits for its refresh, and the tables refreshed
+# by coroutine updaters (LLDP) answer it from the data of before the idle window.
+DEFAULT_UPDATE_IDLE_TIMEOUT = None
+
 event_loop = asyncio.get_event_loop()
 shutdown_task = None
 
@@ -43,12 +57,19 @@ def shutdown(signame, agent):
     shutdown_task = event_loop.create_task(agent.shutdown())
 
 
-def main(update_frequency=None):
+def main(update_frequency=None, update_intervals=None, idle_timeout=None, materialize=False, update_workers=0):
     global event_loop
 
     try:
-        # initialize handler and set update frequency (or use the default)
-        agent = ax_interface.Agent(SonicMIB, update_frequency or DEFAULT_UPDATE_FREQUENCY, event_loop)
+        # initialize handler and set update frequencies (or use the defaults)
+        intervals = dict(DEFAULT_UPDATE_INTERVALS)
+        intervals.update(update_intervals or {})
+        if idle_timeout is None:
+            idle_timeout = DEFAULT_UPDATE_IDLE_TIMEOUT
+        agent = ax_interface.Agent(SonicMIB, update_frequency or DEFAULT_UPDATE_FREQUENCY, event_loop,
+                                   materialize=materialize, update_workers=update_workers,
+                                   update_intervals=intervals,
+                                   idle_timeout=idle_timeout or None)
 
         # add "shutdown" signal handlers
         # https://docs.python.org/3.5/library/asyncio-eventloop.html#set-signal-handlers-for-sigint-and-sigterm
@@ -68,6 +89,7 @@ def main(update_frequency=None):
             # make sure shutdown has completed completely before closing the loop
             event_loop.run_until_complete(shutdown_task)
 
+        mibs.close_resp_pools()
         # the agent runtime has exited, close the event loop and exit.
         event_loop.close()
         logger.info("Goodbye!")
@@ -1,20 +1,59 @@
+import asyncio
 import pprint
 import re
+import ipaddress
+import itertools
+import threading
+import time
+from array import array
+from collections import Counter, namedtuple
 
 from swsssdk import SonicV2Connector
 from swsssdk import port_util
 from swsssdk.port_util import get_index
+from ax_interface import PackedIndex, SortedIndex
 from sonic_ax_impl import logger, _if_alias_map
+from sonic_ax_impl import resp
 
 COUNTERS_PORT_NAME_MAP = b'COUNTERS_PORT_NAME_MAP'
+PORT_TABLE = b'PORT_TABLE'
 LAG_TABLE = b'LAG_TABLE'
 LAG_MEMBER_TABLE = b'LAG_MEMBER_TABLE'
+ROUTE_TABLE = b'ROUTE_TABLE'
 APPL_DB = 'APPL_DB'
 ASIC_DB = 'ASIC_DB'
 COUNTERS_DB = 'COUNTERS_DB'
 
+# database numbers, as assigned by swsssdk.
+DATABASES = {
+    APPL_DB: 0,
+    ASIC_DB: 1,
+    COUNTERS_DB: 2,
+}
+
 redis_kwargs = {'unix_socket_path': '/var/run/redis/redis.sock'}
 
+# { db_name -> resp.RespPool }, see resp_pool()
+resp_pools = {}
+
+# Longest a fetch waits (in seconds) for its missing hashes to (re)appear, see wait_for_stragglers().
+FETCH_TIMEOUT = 0.05
+FETCH_RETRY_INTERVAL = 0.01
+
+# { db_name -> number of fetches that gave up on a missing hash }
+fetch_misses = Counter()
+
+# Keys asked for per SCAN call, see scan_keys().
+SCAN_COUNT = 1000
+
+# process-wide instances, see interface_registry(), interface_counters() and route_table(). They are shared by
+# updaters that may refresh concurrently from the update thread pool (--update-workers), so each one owns its
+# connection, changes its state only under its lock and hands out objects that are never changed afterwards. They are
+# created by the updaters' constructors, on the main thread, before any worker runs.
+_interface_registry = None
+_interface_counters = None
+_route_table = None
+
 def counter_table(sai_id):
     """
     :param if_name: given sai_id to cast.
@@ -47,6 +86,182 @@ def lag_entry_table(lag_name):
     return b'LAG_TABLE:' + lag_name
 
 
+def route_entry_table(prefix):
+    """
+    :param prefix: given route prefix to cast (e.g. b'0.0.0.0/0').
+    :return: ROUTE_TABLE key.
+    """
+    return b'ROUTE_TABLE:' + prefix
+
+
+def get_all_within(db_conn, db_name, _hash, timeout=FETCH_TIMEOUT):
+    """
+    Fetches a hash, retrying until 'timeout' while it is missing (or empty). Unlike db_conn.get_all(...,
+    blocking=True), which waits for as long as it takes the hash to reappear, it never stalls the caller for longer
+    than 'timeout'--and never at all on the event loop (see wait_for_stragglers).
+    :param db_conn: database connector, connected to db_name
+    :param db_name: database name
+    :param _hash: hash key to fetch
+    :param timeout: longest wait (in seconds). 0 tries once, e.g. for keys just returned by SCAN.
+    :return: the hash, or {} if it is still missing at the deadline (counted in fetch_misses)
+    """
+    return get_all_bulk(db_conn, db_name, [_hash], blocking=True, timeout=timeout)[0]
+
+
+def on_event_loop():
+    """
+    :return: True on a thread running an asyncio event loop.
+    """
+    # public as asyncio.get_running_loop() from Python 3.7, which raises instead of returning None.
+    return asyncio._get_running_loop() is not None
+
+
+def wait_for_stragglers(db_name, _hashes, results, refetch, missing, timeout=FETCH_TIMEOUT):
+    """
+    Retries the entries of a bulk fetch that are missing, all of them per round trip, until they turn up or a single
+    deadline for the whole fetch passes. The event loop must never sleep: there, the entries are not retried, and
+    updaters that want them waited for run in the update thread pool instead (see Agent 'update_workers').
+    :param db_name: database name
+    :param _hashes: hash keys fetched
+    :param results: fetched entries, in the order of _hashes. Updated in place.
+    :param refetch: list of hash keys -> list of their entries (a single round trip)
+    :param missing: entry -> whether it is missing
+    :param timeout: longest wait (in seconds) for the whole fetch. 0 never waits.
+    """
+    pending = [i for i, result in enumerate(results) if missing(result)]
+    if pending and timeout > 0 and not on_event_loop():
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(FETCH_RETRY_INTERVAL, remaining))
+            for i, result in zip(pending, refetch([_hashes[i] for i in pending])):
+                results[i] = result
+            pending = [i for i in pending if missing(results[i])]
+
+    for i in pending:
+        fetch_misses[db_name] += 1
+        logger.debug("'{}' missing from {}, skipped.".format(_hashes[i], db_name))
+
+
+def scan_keys(db_conn, db_name, pattern, count=SCAN_COUNT):
+    """
+    Enumerates the keys matching 'pattern' with SCAN, a batch at a time. Unlike KEYS, which walks the whole keyspace
+    in one command, it never holds the (shared) Redis server for long, and the keys need not all be in memory at once.
+    As with SCAN, a key may be yielded more than once if the keyspace changes during the enumeration.
+    :param db_conn: database connector, connected to db_name
+    :param db_name: database name
+    :param pattern: glob-style pattern of the keys
+    :param count: keys asked for per SCAN call
+    :return: generator of the matching keys
+    """
+    client = db_conn.get_redis_client(db_name)
+    cursor = 0
+    while True:
+        cursor, keys = client.scan(cursor, match=pattern, count=count)
+        yield from keys
+        if int(cursor) == 0:
+            return
+
+
+def get_all_bulk(db_conn, db_name, _hashes, blocking=False, timeout=FETCH_TIMEOUT):
+    """
+    Fetches several hashes in a single round trip, over a Redis pipeline.
+    :param db_conn: database connector, connected to db_name
+    :param db_name: database name
+    :param _hashes: hash keys to fetch
+    :param blocking: wait (see wait_for_stragglers) for any hash that is missing or empty
+    :param timeout: longest wait (in seconds), for all the missing hashes together
+    :return: list of dicts, in the order of _hashes
+    """
+    def fetch(_hashes):
+        pipe = db_conn.get_redis_client(db_name).pipeline(transaction=False)
+        for _hash in _hashes:
+            pipe.hgetall(_hash)
+        return pipe.execute()
+
+    _hashes = list(_hashes)
+    results = fetch(_hashes)
+    if blocking:
+        wait_for_stragglers(db_name, _hashes, results, fetch, lambda result: not result, timeout)
+    return results
+
+
+def get_fields_bulk(db_conn, db_name, _hashes, fields, blocking=False, timeout=FETCH_TIMEOUT):
+    """
+    Fetches only the given fields of several hashes, in a single round trip (HMGET over a Redis pipeline).
+    :param db_conn: database connector, connected to db_name
+    :param db_name: database name
+    :param _hashes: hash keys to fetch
+    :param fields: field names to fetch from each hash
+    :param blocking: wait (see wait_for_stragglers) for any hash that is missing
+    :param timeout: longest wait (in seconds), for all the missing hashes together
+    :return: list of lists of values (None where a field is absent), in the order of _hashes and fields
+    """
+    _hashes = list(_hashes)
+    fields = list(fields)
+    if not fields:
+        return [[] for _ in _hashes]
+
+    def fetch(_hashes):
+        pipe = db_conn.get_redis_client(db_name).pipeline(transaction=False)
+        for _hash in _hashes:
+            pipe.hmget(_hash, fields)
+        return pipe.execute()
+
+    results = fetch(_hashes)
+    if blocking:
+        wait_for_stragglers(db_name, _hashes, results, fetch, lambda result: all(value is None for value in result),
+                            timeout)
+    return results
+
+
+def field_name(table_name):
+    """
+    :param table_name: the redis field (either Enum or string literal).
+    :return: the field name, as stored in redis.
+    """
+    # Enum.name or table_name = 'name_of_the_table'
+    return bytes(getattr(table_name, 'name', table_name), 'utf-8')
+
+
+def resp_pool(db_name):
+    """
+    :return: the asyncio connection pool shared by everyone reading db_name, created on first use (after config()).
+    """
+    pool = resp_pools.get(db_name)
+    if pool is None:
+        pool = resp_pools[db_name] = resp.RespPool(DATABASES[db_name], **redis_kwargs)
+    return pool
+
+
+def close_resp_pools():
+    for pool in resp_pools.values():
+        pool.close()
+    resp_pools.clear()
+
+
+def _checked(replies):
+    for reply in replies:
+        if isinstance(reply, resp.RespError):
+            raise reply
+    return replies
+
+
+async def async_get_fields_bulk(db_name, _hashes, fields):
+    """
+    Asyncio counterpart of get_fields_bulk(): fetches only 'fields' of several hashes in one pipeline, without
+    blocking the loop.
+    :return: list of lists of values (None where a field is absent), in the order of _hashes and fields
+    """
+    fields = tuple(fields)
+    _hashes = list(_hashes)
+    if not fields:
+        return [[] for _ in _hashes]
+    return _checked(await resp_pool(db_name).pipeline(('HMGET', _hash) + fields for _hash in _hashes))
+
+
 def config(**kwargs):
     global redis_kwargs
     redis_kwargs = {k:v for (k,v) in kwargs.items() if k in ['unix_socket_path', 'host', 'port']}
@@ -132,25 +347,18 @@ def init_sync_d_lag_tables(db_conn):
 
     db_conn.connect(APPL_DB)
 
-    lag_entries = db_conn.keys(APPL_DB, b"LAG_TABLE:*")
-
-    if not lag_entries:
-        return lag_name_if_name_map, if_name_lag_name_map, oid_lag_name_map
+    for lag_entry in scan_keys(db_conn, APPL_DB, b"LAG_TABLE:*"):
+        lag_name_if_name_map.setdefault(lag_entry[len(b"LAG_TABLE:"):], [])
 
-    for lag_entry in lag_entries:
-        lag_name = lag_entry[len(b"LAG_TABLE:"):]
-        lag_members = db_conn.keys(APPL_DB, b"LAG_MEMBER_TABLE:%s:*" % lag_name)
-        # TODO: db_conn.keys() should really return [] instead of None
-        if lag_members is None:
-            lag_members = []
-
-        def member_name_str(val, lag_name):
-            return val[len(b"LAG_MEMBER_TABLE:%s:" % lag_name):]
-
-        lag_member_names = [member_name_str(m, lag_name) for m in lag_members]
-        lag_name_if_name_map[lag_name] = lag_member_names
-        for lag_member_name in lag_member_names:
-            if_name_lag_name_map[lag_member_name] = lag_name
+    # a single SCAN for the members of every LAG.
+    for lag_member_entry in scan_keys(db_conn, APPL_DB, b"LAG_MEMBER_TABLE:*"):
+        lag_name, _, lag_member_name = lag_member_entry[len(b"LAG_MEMBER_TABLE:"):].partition(b':')
+        lag_member_names = lag_name_if_name_map.get(lag_name)
+        # SCAN may repeat a key.
+        if lag_member_names is None or lag_member_name in lag_member_names:
+            continue
+        lag_member_names.append(lag_member_name)
+        if_name_lag_name_map[lag_member_name] = lag_name
 
     for if_name in lag_name_if_name_map.keys():
         idx = get_index(if_name)
@@ -158,3 +366,559 @@ def init_sync_d_lag_tables(db_conn):
             oid_lag_name_map[idx] = if_name
 
     return lag_name_if_name_map, if_name_lag_name_map, oid_lag_name_map
+
+
+class TableCache:
+    """
+    In-memory copy of some APPL_DB tables (TABLES).
+
+    After the initial load, only the keys reported by Redis keyspace notifications are re-read (see poll()). Where
+    notifications cannot be subscribed to, each poll() falls back to a full reload.
+    """
+
+    TABLES = ()
+
+    def __init__(self):
+        self.db_conn = init_db()
+        self.db_conn.connect(APPL_DB)
+        self.lock = threading.Lock()
+        # { key -> entry }
+        self.entries = {}
+        # subscribe before the initial load, so that no change can slip in between.
+        self.notifications = self._subscribe()
+        self.resync()
+
+    def _subscribe(self):
+        """
+        :return: a PubSub subscribed to the keyspace notifications of TABLES, or None if not available.
+        """
+        client = self.db_conn.get_redis_client(APPL_DB)
+        try:
+            db = client.connection_pool.connection_kwargs['db']
+            pubsub = client.pubsub()
+            for table in self.TABLES:
+                pubsub.psubscribe(b'__keyspace@%d__:%s:*' % (db, table))
+            return pubsub
+        except Exception as e:
+            logger.warning("APPL_DB keyspace notifications are not available, falling back to full reloads: {}"
+                           .format(e))
+            return None
+
+    def _changed_keys(self):
+        """
+        Drains the pending keyspace notifications.
+        :return: set of the keys changed since the last call.
+        """
+        changed = set()
+        while True:
+            message = self.notifications.get_message()
+            if message is None:
+                return changed
+            if message['type'] == 'pmessage':
+                # b'__keyspace@0__:PORT_TABLE:Ethernet0' -> b'PORT_TABLE:Ethernet0'
+                changed.add(message['channel'].split(b':', 1)[1])
+
+    def _fetch(self, keys):
+        """
+        :return: list of entries, in the order of keys. Deleted (or emptied) keys have a false entry.
+        """
+        return get_all_bulk(self.db_conn, APPL_DB, keys)
+
+    def _store(self, key, entry):
+        """
+        Caches the entry of a key, or forgets the key if 'entry' is false.
+        """
+        if entry:
+            self.entries[key] = entry
+        else:
+            self.entries.pop(key, None)
+
+    def _load(self, keys):
+        keys = list(keys)
+        for key, entry in zip(keys, self._fetch(keys)):
+            self._store(key, entry)
+
+    def resync(self):
+        """
+        Reloads every entry, SCAN_COUNT keys at a time. Keys no longer in the tables are forgotten.
+        """
+        with self.lock:
+            if self.notifications is not None:
+                # superseded by the reload.
+                self._changed_keys()
+            stale = set(self.entries)
+            for table in self.TABLES:
+                keys = scan_keys(self.db_conn, APPL_DB, table + b':*')
+                while True:
+                    batch = list(itertools.islice(keys, SCAN_COUNT))
+                    if not batch:
+                        break
+                    stale.difference_update(batch)
+                    self._load(batch)
+            for key in stale:
+                self._store(key, None)
+
+    def poll(self):
+        """
+        Re-reads the entries changed since the last poll.
+        """
+        if self.notifications is None:
+            self.resync()
+            return
+
+        with self.lock:
+            try:
+                changed = self._changed_keys()
+            except Exception as e:
+                # notifications may have been lost.
+                logger.warning("APPL_DB keyspace notifications interrupted, reloading: {}".format(e))
+                self.notifications = None
+            else:
+                if changed:
+                    self._load(changed)
+                return
+
+        self.notifications = self._subscribe()
+        self.resync()
+
+    def get(self, key):
+        """
+        :param key: APPL_DB key (e.g. if_entry_table(if_name))
+        :return: the cached entry (not to be modified), or None.
+        """
+        return self.entries.get(key)
+
+
+class ApplDbCache(TableCache):
+    """
+    In-memory copy of the APPL_DB PORT_TABLE, LAG_TABLE and LAG_MEMBER_TABLE hashes.
+    """
+
+    TABLES = (PORT_TABLE, LAG_TABLE, LAG_MEMBER_TABLE)
+
+    def __init__(self):
+        # LAG maps built from the entries, until a LAG key changes.
+        self.lags = None
+        super().__init__()
+
+    def _store(self, key, entry):
+        super()._store(key, entry)
+        if not key.startswith(PORT_TABLE + b':'):
+            self.lags = None
+
+    def lag_tables(self):
+        """
+        :return: LagTables built from the cached LAG_TABLE and LAG_MEMBER_TABLE entries. The same object is returned
+        until a LAG key changes.
+        """
+        with self.lock:
+            if self.lags is None:
+                self.lags = self._build_lag_tables()
+            return self.lags
+
+    def _build_lag_tables(self):
+        lag_name_if_name_map = {}
+        if_name_lag_name_map = {}
+        oid_lag_name_map = {}
+
+        lag_prefix = LAG_TABLE + b':'
+        member_prefix = LAG_MEMBER_TABLE + b':'
+        for key in self.entries:
+            if key.startswith(lag_prefix):
+                lag_name_if_name_map.setdefault(key[len(lag_prefix):], [])
+        for key in self.entries:
+            if key.startswith(member_prefix):
+                lag_name, _, lag_member_name = key[len(member_prefix):].partition(b':')
+                if lag_name in lag_name_if_name_map:
+                    lag_name_if_name_map[lag_name].append(lag_member_name)
+                    if_name_lag_name_map[lag_member_name] = lag_name
+
+        for lag_name in lag_name_if_name_map:
+            idx = get_index(lag_name)
+            if idx:
+                oid_lag_name_map[idx] = lag_name
+
+        return LagTables(lag_name_if_name_map, if_name_lag_name_map, oid_lag_name_map)
+
+
+"""
+A ROUTE_TABLE entry: prefix (ipaddress.ip_network), then the next hops and their interfaces (tuples of str, in
+the same order).
+"""
+RouteEntry = namedtuple('RouteEntry', ['prefix', 'nexthops', 'ifnames'])
+
+
+"""
+The routes as of a RouteTable generation: { key -> RouteEntry }, and the ipCidrRouteTable rows (PackedIndex). Never
+changed once handed out--later generations get their own copies of whatever changed.
+"""
+RouteSnapshot = namedtuple('RouteSnapshot', ['generation', 'routes', 'cidr_index'])
+
+
+class RouteTable(TableCache):
+    """
+    In-memory copy of the APPL_DB ROUTE_TABLE ({ key -> RouteEntry }), kept up to date like ApplDbCache. Single
+    source of the routes for every route MIB (RFC1213 'ipRouteTable', RFC4292 'ipCidrRouteTable'), see route_table().
+
+    Consumers poll through latest(), passing back the generation they last adopted: ROUTE_TABLE is only re-read when
+    that consumer has already seen the latest generation. With several consumers on the same interval, the first one
+    to refresh in a cycle pays for the poll and the others adopt its result.
+
+    Alongside, it maintains the ipCidrRouteTable rows: ipCidrRouteDest (4 sub-ids), ipCidrRouteMask (4),
+    ipCidrRouteTos (1), ipCidrRouteNextHop (4), one per IPv4 route and next hop. Only the rows of the routes that
+    changed are added or removed, on a copy of the previous generation's index.
+    """
+
+    TABLES = (ROUTE_TABLE,)
+    FIELDS = (b'nexthop', b'ifname')
+
+    # ipCidrRouteTos of every row.
+    TOS = 0
+
+    # TODO: non front panel interfaces should not be in APPL_DB at very beginning
+    # This is to workaround the bug in current sonic-swss implementation
+    EXCLUDED_IFNAMES = frozenset(['eth0', 'lo', 'docker0'])
+
+    def __init__(self):
+        # rows added (removed) since the last generation.
+        self.cidr_added = set()
+        self.cidr_removed = set()
+        # whether any route changed since the last generation.
+        self.changed = False
+        # consumers may refresh from the update thread pool; held across poll() and publishing.
+        self.snapshot_lock = threading.Lock()
+        self.snapshot = RouteSnapshot(0, {}, PackedIndex(13))
+        super().__init__()
+        self.snapshot = self._publish()
+
+    def latest(self, seen=None):
+        """
+        :param seen: the generation last adopted by the caller.
+        :return: the latest RouteSnapshot, polled first if the caller has already seen it.
+        """
+        with self.snapshot_lock:
+            if seen == self.snapshot.generation:
+                self.poll()
+                self.snapshot = self._publish()
+            return self.snapshot
+
+    def _publish(self):
+        """
+        :return: the RouteSnapshot of the next generation. It shares the routes and rows of the previous one, unless
+        they changed.
+        """
+        previous = self.snapshot
+        routes, cidr_index = previous.routes, previous.cidr_index
+        with self.lock:
+            if self.changed:
+                routes = dict(self.entries)
+                self.changed = False
+            if self.cidr_added or self.cidr_removed:
+                cidr_index = cidr_index.copy()
+                cidr_index.update(self.cidr_added, self.cidr_removed)
+                self.cidr_added = set()
+                self.cidr_removed = set()
+        return RouteSnapshot(previous.generation + 1, routes, cidr_index)
+
+    def _fetch(self, keys):
+        entries = []
+        for key, (nexthops, ifnames) in zip(keys, get_fields_bulk(self.db_conn, APPL_DB, keys, self.FIELDS)):
+            if nexthops is None and ifnames is None:
+                entries.append(None)
+                continue
+            try:
+                prefix = ipaddress.ip_network(key[len(ROUTE_TABLE) + 1:].decode(), strict=False)
+            except ValueError as e:
+                logger.error("APPL_DB includes invalid ROUTE_TABLE entry '{}': {}.".format(key, e))
+                entries.append(None)
+                continue
+            entries.append(RouteEntry(prefix,
+                                      tuple(nexthops.decode().split(',')) if nexthops else (),
+                                      tuple(ifnames.decode().split(',')) if ifnames else ()))
+        return entries
+
+    def _store(self, key, entry):
+        previous = self.entries.get(key)
+        if previous == (entry or None):
+            return
+        super()._store(key, entry)
+        self.changed = True
+        old_rows = self._cidr_rows(previous) if previous else set()
+        new_rows = self._cidr_rows(entry) if entry else set()
+        for row in old_rows - new_rows:
+            if row in self.cidr_added:
+                self.cidr_added.remove(row)
+            else:
+                self.cidr_removed.add(row)
+        for row in new_rows - old_rows:
+            if row in self.cidr_removed:
+                self.cidr_removed.remove(row)
+            else:
+                self.cidr_added.add(row)
+
+    def _cidr_rows(self, entry):
+        """
+        :return: set of the ipCidrRouteTable rows of a route.
+        """
+        rows = set()
+        if entry.prefix.version != 4:
+            return rows
+        dest_mask_tos = entry.prefix.network_address.packed + entry.prefix.netmask.packed + bytes([self.TOS])
+        for nexthop, ifname in zip(entry.nexthops, entry.ifnames):
+            if ifname in self.EXCLUDED_IFNAMES:
+                continue
+            try:
+                rows.add(tuple(dest_mask_tos + ipaddress.IPv4Address(nexthop).packed))
+            except ValueError:
+                # no (or an IPv6) next hop.
+                continue
+        return rows
+
+
+"""
+Interface maps, as returned by init_sync_d_interface_tables().
+"""
+InterfaceTables = namedtuple('InterfaceTables', [
+    'if_name_map', 'if_alias_map', 'if_id_map', 'oid_sai_map', 'oid_name_map',
+])
+
+"""
+LAG membership maps, as returned by init_sync_d_lag_tables().
+"""
+LagTables = namedtuple('LagTables', [
+    'lag_name_if_name_map', 'if_name_lag_name_map', 'oid_lag_name_map',
+])
+
+
+class InterfaceRegistry:
+    """
+    Owns the interface and LAG maps for every MIB that needs them.
+
+    The interface tables are only rebuilt when COUNTERS_PORT_NAME_MAP differs from the one they were built from; until
+    then, the same InterfaceTables object is handed out. Subscribers compare it by identity to find out whether the
+    ports changed. The LAG maps come from the APPL_DB cache, the same way.
+    """
+
+    def __init__(self):
+        self.db_conn = init_db()
+        self.db_conn.connect(COUNTERS_DB)
+        # callers may refresh from the update thread pool.
+        self.lock = threading.Lock()
+        # COUNTERS_PORT_NAME_MAP the interface tables were built from.
+        self.port_name_map = None
+        self.interfaces = None
+        # PORT_TABLE and LAG tables.
+        self.appl_db = ApplDbCache()
+
+    def refresh_interfaces(self):
+        """
+        :return: the InterfaceTables, rebuilt first if COUNTERS_PORT_NAME_MAP changed.
+        """
+        with self.lock:
+            port_name_map = get_all_within(self.db_conn, COUNTERS_DB, COUNTERS_PORT_NAME_MAP)
+            if not port_name_map and self.interfaces is not None:
+                # momentarily missing--keep the current tables rather than dropping every port.
+                return self.interfaces
+            if self.interfaces is None or port_name_map != self.port_name_map:
+                logger.info("Port name map changed, rebuilding the interface tables.")
+                self.interfaces = InterfaceTables(*init_sync_d_interface_tables(self.db_conn))
+                self.port_name_map = port_name_map
+            return self.interfaces
+
+    def refresh_lags(self):
+        """
+        Applies the pending APPL_DB changes.
+        :return: the LagTables, rebuilt first if a LAG or LAG member changed.
+        """
+        self.appl_db.poll()
+        return self.appl_db.lag_tables()
+
+
+def route_table():
+    """
+    :return: the process-wide RouteTable, created on first use (after config()).
+    """
+    global _route_table
+    if _route_table is None:
+        _route_table = RouteTable()
+    return _route_table
+
+
+def interface_registry():
+    """
+    :return: the process-wide InterfaceRegistry, created on first use (after config()).
+    """
+    global _interface_registry
+    if _interface_registry is None:
+        _interface_registry = InterfaceRegistry()
+    return _interface_registry
+
+
+class CounterMatrix:
+    """
+    Interface counters as an (interfaces x fields) matrix of unsigned 64-bit integers, built once per refresh.
+
+    Rows are interface OIDs. A LAG row holds the sum of its member ports' rows, so reading any counter is a single
+    lookup. Counters absent from COUNTERS_DB (or not a number) read as None.
+    """
+
+    MASK = 0xffffffffffffffff
+
+    def __init__(self, fields, port_counters, lag_members):
+        """
+        :param fields: field names (bytes), in column order.
+        :param port_counters: dict of port OID -> list of values (bytes or None) in column order, e.g. from
+        get_fields_bulk().
+        :param lag_members: dict of LAG OID -> list of member port OIDs.
+        """
+        # { field name (str) -> column }
+        self.columns = {field.decode(): column for column, field in enumerate(fields)}
+        self.width = len(fields)
+        # { OID -> row }
+        self.rows = {}
+        self.values = array('Q')
+        # 1 where the counter is absent.
+        self.missing = bytearray()
+
+        for oid, values in port_counters.items():
+            self._append(oid, [self._parse(value) for value in values])
+
+        for oid, members in lag_members.items():
+            member_starts = [self.rows[member] * self.width for member in members if member in self.rows]
+            totals = []
+            for column in range(self.width):
+                total = 0
+                for start in member_starts:
+                    if self.missing[start + column]:
+                        total = None
+                        break
+                    total += self.values[start + column]
+                totals.append(total if total is None else total & CounterMatrix.MASK)
+            self._append(oid, totals)
+
+    @staticmethod
+    def _parse(value):
+        if value is None:
+            return None
+        try:
+            return int(value) & CounterMatrix.MASK
+        except ValueError:
+            logger.warning("SyncD 'COUNTERS_DB' invalid counter value '{}'.".format(value))
+            return None
+
+    def _append(self, oid, values):
+        self.rows[oid] = len(self.rows)
+        self.values.extend(0 if value is None else value for value in values)
+        self.missing.extend(value is None for value in values)
+
+    def get(self, oid, table_name):
+        """
+        :param oid: the interface OID.
+        :param table_name: the redis field (either Enum or string literal).
+        :return: the 64-bit counter, or None if absent.
+        """
+        try:
+            position = self.rows[oid] * self.width + self.columns[getattr(table_name, 'name', table_name)]
+        except KeyError:
+            return None
+        if self.missing[position]:
+            return None
+        return self.values[position]
+
+
+"""
+Immutable view of the interface maps and COUNTERS_DB counters, shared by the interface MIBs.
+"""
+InterfaceSnapshot = namedtuple('InterfaceSnapshot', [
+    'if_name_map', 'if_alias_map', 'if_id_map', 'oid_sai_map', 'oid_name_map',
+    'lag_name_if_name_map', 'if_name_lag_name_map', 'oid_lag_name_map',
+    'counters', 'if_range',
+])
+
+
+class InterfaceCounters:
+    """
+    Single source of the interface maps and counters for every interface MIB (RFC1213 'interfaces', RFC2863 'ifXTable').
+
+    Each consumer passes back the last snapshot it adopted: the counters are only re-fetched when that consumer has
+    already seen the latest snapshot. With several consumers on the same interval, the first one to refresh in a cycle
+    pays for the fetch and the others adopt its result.
+
+    Only the counter fields registered by the consumers are fetched (HMGET), into the snapshot's CounterMatrix.
+    """
+
+    def __init__(self, registry=None):
+        """
+        :param registry: InterfaceRegistry providing the interface and LAG maps. Defaults to the process-wide one.
+        """
+        self.registry = registry or interface_registry()
+        self.db_conn = init_db()
+        self.db_conn.connect(COUNTERS_DB)
+        # consumers may refresh from the update thread pool.
+        self.lock = threading.Lock()
+        self.tables = None
+        self.reinit_pending = True
+        # fields fetched from each COUNTERS hash.
+        self.counter_fields = []
+        self.snapshot = None
+
+    def register_fields(self, table_names):
+        """
+        Adds counter fields to fetch. Snapshots taken before do not include them, and are not handed out anymore.
+        :param table_names: iterable of redis fields (either Enum or string literal), e.g. an Enum class.
+        """
+        with self.lock:
+            for name in map(field_name, table_names):
+                if name not in self.counter_fields:
+                    self.counter_fields.append(name)
+                    self.snapshot = None
+
+    def reinit(self):
+        """
+        Checks the interface tables for changes on the next refresh.
+        """
+        self.reinit_pending = True
+
+    def latest(self, seen=None):
+        """
+        :param seen: the snapshot last adopted by the caller.
+        :return: the latest InterfaceSnapshot, refreshed first if the caller has already seen it.
+        """
+        with self.lock:
+            if self.snapshot is None or self.snapshot is seen:
+                self.snapshot = self._refresh()
+            return self.snapshot
+
+    def _refresh(self):
+        if self.reinit_pending:
+            self.tables = self.registry.refresh_interfaces()
+            self.reinit_pending = False
+        if_name_map, if_alias_map, if_id_map, oid_sai_map, oid_name_map = self.tables
+
+        lag_name_if_name_map, \
+        if_name_lag_name_map, \
+        oid_lag_name_map = self.registry.refresh_lags()
+
+        oids = list(oid_sai_map)
+        port_counters = dict(zip(oids, get_fields_bulk(self.db_conn, COUNTERS_DB,
+                                                       (counter_table(oid_sai_map[oid]) for oid in oids),
+                                                       self.counter_fields, blocking=True)))
+        lag_members = {oid: [get_index(lag_member) for lag_member in lag_name_if_name_map[lag_name]]
+                       for oid, lag_name in oid_lag_name_map.items()}
+        counters = CounterMatrix(self.counter_fields, port_counters, lag_members)
+
+        if_range = SortedIndex((i,) for i in list(oid_sai_map.keys()) + list(oid_lag_name_map.keys()))
+
+        return InterfaceSnapshot(if_name_map, if_alias_map, if_id_map, oid_sai_map, oid_name_map,
+                                 lag_name_if_name_map, if_name_lag_name_map, oid_lag_name_map,
+                                 counters, if_range)
+
+
+def interface_counters():
+    """
+    :return: the process-wide InterfaceCounters, created on first use (after config()).
+    """
+    global _interface_counters
+    if _interface_counters is None:
+        _interface_counters = InterfaceCounters()
+    return _interface_counters
@@ -26,18 +26,21 @@ class LLDPRemoteTables(int, Enum):
     # lldp_rem_sys_cap_enabled = 12
 
 
+# LLDP_ENTRY_TABLE fields fetched for each interface, and their position in LLDPUpdater.lldp_counters entries.
+LLDP_FIELDS = [mibs.field_name(table) for table in LLDPRemoteTables]
+LLDP_FIELD_INDEX = {field: position for position, field in enumerate(LLDP_FIELDS)}
+
+
 class LLDPUpdater(MIBUpdater):
     def __init__(self):
         super().__init__()
 
-        self.db_conn = mibs.init_db()
         self.reinit_data()
 
-        # cache of interface counters
-        # { sai_id -> { 'counter': 'value' } }
+        # cache of LLDP remote tables
+        # { if_name -> [ 'value' (in LLDP_FIELDS order) ] }
+        # seeded by the first (asynchronous) update, see MIBUpdater.is_coroutine.
         self.lldp_counters = {}
-        # call our update method once to "seed" data before the "Agent" starts accepting requests.
-        self.update_data()
 
     def reinit_data(self):
         """
@@ -47,22 +50,21 @@ class LLDPUpdater(MIBUpdater):
         self.if_alias_map, \
         self.if_id_map, \
         self.oid_sai_map, \
-        self.oid_name_map = mibs.init_sync_d_interface_tables(self.db_conn)
+        self.oid_name_map = mibs.interface_registry().refresh_interfaces()
 
-    def update_data(self):
+    async def update_data(self):
         """
         Subclass update data routine. Updates available LLDP counters.
         """
-
-        # establish connection to application database.
-        self.db_conn.connect(mibs.APPL_DB)
-
+        if_names = list(self.if_name_map)
+        lldp_entries = await mibs.async_get_fields_bulk(mibs.APPL_DB,
+                                                        (mibs.lldp_entry_table(if_name) for if_name in if_names),
+                                                        LLDP_FIELDS)
         self.lldp_counters = {}
-        for if_name in self.if_name_map:
-            lldp_kvs = self.db_conn.get_all(mibs.APPL_DB, mibs.lldp_entry_table(if_name))
-            if not lldp_kvs:
+        for if_name, lldp_values in zip(if_names, lldp_entries):
+            if all(value is None for value in lldp_values):
                 continue
-            self.lldp_counters.update({if_name: lldp_kvs})
+            self.lldp_counters[if_name] = lldp_values
         if not self.lldp_counters:
             logger.warning("0 - b'LLDP_ENTRY_TABLE' is empty. No LLDP information could be retrieved.")
 
@@ -79,9 +81,12 @@ class LLDPUpdater(MIBUpdater):
             # no LLDP data for this interface
             return None
         counters = self.lldp_counters[if_name]
-        _table_name = bytes(getattr(table_name, 'name', table_name), 'utf-8')
+        _table_name = mibs.field_name(table_name)
         try:
-            return counters[_table_name]
+            value = counters[LLDP_FIELD_INDEX[_table_name]]
+            if value is None:
+                raise KeyError(_table_name)
+            return value
         except KeyError as e:
             mibs.logger.warning(" 0 - b'LLDP_ENTRY_TABLE' missing attribute '{}'.".format(e))
             return None
@@ -1,10 +1,9 @@
 import ipaddress
 import python_arptable
 from enum import unique, Enum
-from bisect import bisect_right
 
 from sonic_ax_impl import mibs
-from ax_interface import MIBMeta, ValueType, MIBUpdater, MIBEntry, SubtreeMIBEntry
+from ax_interface import MIBMeta, ValueType, MIBUpdater, MIBEntry, SubtreeMIBEntry, SortedIndex
 from ax_interface.encodings import ObjectIdentifier
 from ax_interface.util import mac_decimals, ip2tuple_v4
 
@@ -49,13 +48,13 @@ class ArpUpdater(MIBUpdater):
     def __init__(self):
         super().__init__()
         self.arp_dest_map = {}
-        self.arp_dest_list = []
+        self.arp_dest_list = SortedIndex()
         # call our update method once to "seed" data before the "Agent" starts accepting requests.
         self.update_data()
 
     def update_data(self):
         self.arp_dest_map = {}
-        self.arp_dest_list = []
+        arp_dest_list = []
         for entry in python_arptable.get_arp_table():
             dev = entry['Device']
             mac = entry['HW address']
@@ -73,62 +72,51 @@ class ArpUpdater(MIBUpdater):
 
             subid = (if_index,) + iptuple
             self.arp_dest_map[subid] = machex
-            self.arp_dest_list.append(subid)
-        self.arp_dest_list.sort()
+            arp_dest_list.append(subid)
+        self.arp_dest_list = SortedIndex(arp_dest_list)
 
     def arp_dest(self, sub_id):
         return self.arp_dest_map.get(sub_id, None)
 
     def get_next(self, sub_id):
-        right = bisect_right(self.arp_dest_list, sub_id)
-        if right >= len(self.arp_dest_list):
-            return None
-        return self.arp_dest_list[right]
+        return self.arp_dest_list.get_next(sub_id)
 
 class NextHopUpdater(MIBUpdater):
     def __init__(self):
         super().__init__()
-        self.db_conn = mibs.init_db()
+        self.routes = mibs.route_table()
+        # RouteTable generation last adopted.
+        self.routes_seen = None
         self.update_data()
 
     def update_data(self):
         """
         Update redis (caches config)
-        Pulls the table references for each interface.
+        Adopts the latest routes, shared with the other route MIBs, when their generation moved. The caller
+        (MIBUpdater.run_once) follows with refreshed().
         """
-        self.nexthop_map = {}
-        self.route_list = []
-
-        self.db_conn.connect(mibs.APPL_DB)
-        route_entries = self.db_conn.keys(mibs.APPL_DB, "ROUTE_TABLE:*")
-        if not route_entries:
+        snapshot = self.routes.latest(self.routes_seen)
+        if snapshot.generation == self.routes_seen:
             return
-
-        for route_entry in route_entries:
-            routestr = route_entry.decode()
-            ipnstr = routestr[len("ROUTE_TABLE:"):]
-            if ipnstr == "0.0.0.0/0":
-                ipn = ipaddress.ip_network(ipnstr)
-                ent = self.db_conn.get_all(mibs.APPL_DB, routestr, blocking=True)
-                nexthops = ent[b"nexthop"].decode()
-                for nh in nexthops.split(','):
-                    # TODO: if ipn contains IP range, create more sub_id here
-                    sub_id = ip2tuple_v4(ipn.network_address)
-                    self.route_list.append(sub_id)
-                    self.nexthop_map[sub_id] = ipaddress.ip_address(nh).packed
-                    break # Just need the first nexthop
-
-        self.route_list.sort()
+        self.routes_seen = snapshot.generation
+
+        nexthop_map = {}
+        route_list = SortedIndex()
+        route = snapshot.routes.get(mibs.route_entry_table(b"0.0.0.0/0"))
+        if route is not None and route.nexthops:
+            # TODO: if route.prefix contains IP range, create more sub_id here
+            sub_id = ip2tuple_v4(route.prefix.network_address)
+            # Just need the first nexthop
+            nexthop_map[sub_id] = ipaddress.ip_address(route.nexthops[0]).packed
+            route_list = SortedIndex([sub_id])
+        self.nexthop_map = nexthop_map
+        self.route_list = route_list
 
     def nexthop(self, sub_id):
         return self.nexthop_map.get(sub_id, None)
 
     def get_next(self, sub_id):
-        right = bisect_right(self.route_list, sub_id)
-        if right >= len(self.route_list):
-            return None
-
-        return self.route_list[right]
+        return self.route_list.get_next(sub_id)
 
 class IpMib(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.4'):
     arp_updater = ArpUpdater()
@@ -143,16 +131,12 @@ class IpMib(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.4'):
 class InterfacesUpdater(MIBUpdater):
     def __init__(self):
         super().__init__()
-        self.db_conn = mibs.init_db()
-        self.reinit_data()
-
-        self.lag_name_if_name_map = {}
-        self.if_name_lag_name_map = {}
-        self.oid_lag_name_map = {}
-
-        # cache of interface counters
-        self.if_counters = {}
-        self.if_range = []
+        # interface maps and counters, shared with the other interface MIBs.
+        self.interfaces = mibs.interface_counters()
+        self.interfaces.register_fields(DbTables)
+        # PORT_TABLE/LAG_TABLE entries, kept up to date by the interface counter refreshes.
+        self.appl_db = self.interfaces.registry.appl_db
+        self.snapshot = None
         # call our update method once to "seed" data before the "Agent" starts accepting requests.
         self.update_data()
 
@@ -160,37 +144,21 @@ class InterfacesUpdater(MIBUpdater):
         """
         Subclass update interface information
         """
-        self.if_name_map, \
-        self.if_alias_map, \
-        self.if_id_map, \
-        self.oid_sai_map, \
-        self.oid_name_map = mibs.init_sync_d_interface_tables(self.db_conn)
+        self.interfaces.reinit()
 
     def update_data(self):
         """
-        Update redis (caches config)
-        Pulls the table references for each interface.
+        Adopts the latest shared interface snapshot (refreshed from redis if this updater has already seen it).
         """
-        self.if_counters = \
-            {sai_id: self.db_conn.get_all(mibs.COUNTERS_DB, mibs.counter_table(sai_id), blocking=True)
-             for sai_id in self.if_id_map}
-
-        self.lag_name_if_name_map, \
-        self.if_name_lag_name_map, \
-        self.oid_lag_name_map = mibs.init_sync_d_lag_tables(self.db_conn)
-
-        self.if_range = sorted(list(self.oid_sai_map.keys()) + list(self.oid_lag_name_map.keys()))
-        self.if_range = [(i,) for i in self.if_range]
+        self.snapshot = self.interfaces.latest(self.snapshot)
+        vars(self).update(self.snapshot._asdict())
 
     def get_next(self, sub_id):
         """
         :param sub_id: The 1-based sub-identifier query.
         :return: the next sub id.
         """
-        right = bisect_right(self.if_range, sub_id)
-        if right == len(self.if_range):
-            return None
-        return self.if_range[right]
+        return self.if_range.get_next(sub_id)
 
     def get_oid(self, sub_id):
         """
@@ -224,26 +192,6 @@ class InterfacesUpdater(MIBUpdater):
 
         return self.if_alias_map[self.oid_name_map[oid]]
 
-    def _get_counter(self, oid, table_name):
-        """
-        :param sub_id: The interface OID.
-        :param table_name: the redis table (either IntEnum or string literal) to query.
-        :return: the counter for the respective sub_id/table.
-        """
-        sai_id = self.oid_sai_map[oid]
-        # Enum.name or table_name = 'name_of_the_table'
-        _table_name = bytes(getattr(table_name, 'name', table_name), 'utf-8')
-
-        try:
-            counter_value = self.if_counters[sai_id][_table_name]
-            # truncate to 32-bit counter (database implements 64-bit counters)
-            counter_value = int(counter_value) & 0x00000000ffffffff
-            # done!
-            return counter_value
-        except KeyError as e:
-            mibs.logger.warning("SyncD 'COUNTERS_DB' missing attribute '{}'.".format(e))
-            return None
-
     def get_counter(self, sub_id, table_name):
         """
         :param sub_id: The 1-based sub-identifier query.
@@ -254,15 +202,14 @@ class InterfacesUpdater(MIBUpdater):
         if not oid:
             return
 
-        if oid in self.oid_lag_name_map:
-            counter_value = 0
-            for lag_member in self.lag_name_if_name_map[self.oid_lag_name_map[oid]]:
-                counter_value += self._get_counter(mibs.get_index(lag_member), table_name)
-
-            # truncate to 32-bit counter
-            return counter_value & 0x00000000ffffffff
-        else:
-            return self._get_counter(oid, table_name)
+        # LAG counters are summed over the members by the CounterMatrix.
+        counter_value = self.counters.get(oid, table_name)
+        if counter_value is None:
+            mibs.logger.warning("SyncD 'COUNTERS_DB' missing attribute '{}'."
+                                .format(getattr(table_name, 'name', table_name)))
+            return None
+        # truncate to 32-bit counter (database implements 64-bit counters)
+        return counter_value & 0x00000000ffffffff
 
     def get_if_number(self):
         """
@@ -285,7 +232,7 @@ class InterfacesUpdater(MIBUpdater):
         else:
             table = mibs.if_entry_table(self.oid_name_map[oid])
 
-        return self.db_conn.get_all(mibs.APPL_DB, table, blocking=True)
+        return self.appl_db.get(table)
 
     def _get_status(self, sub_id, key):
         """
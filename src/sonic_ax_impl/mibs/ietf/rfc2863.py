@@ -1,5 +1,4 @@
 from enum import Enum, unique
-from bisect import bisect_right
 
 from sonic_ax_impl import mibs
 from ax_interface import MIBMeta, MIBUpdater, ValueType, SubtreeMIBEntry
@@ -48,52 +47,32 @@ class InterfaceMIBUpdater(MIBUpdater):
     def __init__(self):
         super().__init__()
 
-        self.db_conn = mibs.init_db()
-        self.reinit_data()
-
-        self.lag_name_if_name_map = {}
-        self.if_name_lag_name_map = {}
-        self.oid_lag_name_map = {}
-
-        self.if_counters = {}
-        self.if_range = []
+        # interface maps and counters, shared with the other interface MIBs.
+        self.interfaces = mibs.interface_counters()
+        self.interfaces.register_fields(DbTables32)
+        self.interfaces.register_fields(DbTables64)
+        self.snapshot = None
         self.update_data()
 
     def reinit_data(self):
         """
         Subclass update interface information
         """
-        self.if_name_map, \
-        self.if_alias_map, \
-        self.if_id_map, \
-        self.oid_sai_map, \
-        self.oid_name_map = mibs.init_sync_d_interface_tables(self.db_conn)
+        self.interfaces.reinit()
 
     def update_data(self):
         """
-        Update redis (caches config)
-        Pulls the table references for each interface.
+        Adopts the latest shared interface snapshot (refreshed from redis if this updater has already seen it).
         """
-        self.if_counters = {
-            sai_id: self.db_conn.get_all(mibs.COUNTERS_DB, mibs.counter_table(sai_id), blocking=True)
-            for sai_id in self.if_id_map}
-
-        self.lag_name_if_name_map, \
-        self.if_name_lag_name_map, \
-        self.oid_lag_name_map = mibs.init_sync_d_lag_tables(self.db_conn)
-
-        self.if_range = sorted(list(self.oid_sai_map.keys()) + list(self.oid_lag_name_map.keys()))
-        self.if_range = [(i,) for i in self.if_range]
+        self.snapshot = self.interfaces.latest(self.snapshot)
+        vars(self).update(self.snapshot._asdict())
 
     def get_next(self, sub_id):
         """
         :param sub_id: The 1-based sub-identifier query.
         :return: the next sub id.
         """
-        right = bisect_right(self.if_range, sub_id)
-        if right == len(self.if_range):
-            return None
-        return self.if_range[right]
+        return self.if_range.get_next(sub_id)
 
     def get_oid(self, sub_id):
         """
@@ -155,25 +134,13 @@ class InterfaceMIBUpdater(MIBUpdater):
         :param mask: mask to apply to counter
         :return: the counter for the respective sub_id/table.
         """
-        if oid in self.oid_lag_name_map:
-            counter_value = 0
-            for lag_member in self.lag_name_if_name_map[self.oid_lag_name_map[oid]]:
-                counter_value += self._get_counter(mibs.get_index(lag_member), table_name, mask)
-
-            return counter_value & mask
-
-        sai_id = self.oid_sai_map[oid]
-        # Enum.name or table_name = 'name_of_the_table'
-        _table_name = bytes(getattr(table_name, 'name', table_name), 'utf-8')
-        try:
-            counter_value = self.if_counters[sai_id][_table_name]
-            # truncate to 32-bit counter (database implements 64-bit counters)
-            counter_value = int(counter_value) & mask
-            # done!
-            return counter_value
-        except KeyError as e:
-            mibs.logger.warning("SyncD 'COUNTERS_DB' missing attribute '{}'.".format(e))
+        # LAG counters are summed over the members by the CounterMatrix.
+        counter_value = self.counters.get(oid, table_name)
+        if counter_value is None:
+            mibs.logger.warning("SyncD 'COUNTERS_DB' missing attribute '{}'."
+                                .format(getattr(table_name, 'name', table_name)))
             return None
+        return counter_value & mask
 
 
 class InterfaceMIBObjects(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.31.1'):
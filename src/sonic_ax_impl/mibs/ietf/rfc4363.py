@@ -3,9 +3,8 @@ from enum import unique, Enum
 
 from sonic_ax_impl import mibs
 from swsssdk import port_util
-from ax_interface import MIBMeta, ValueType, MIBUpdater, ContextualMIBEntry, SubtreeMIBEntry
+from ax_interface import MIBMeta, ValueType, MIBUpdater, ContextualMIBEntry, SubtreeMIBEntry, SortedIndex
 from ax_interface.util import mac_decimals
-from bisect import bisect_right
 
 def fdb_vlanmac(fdb):
     return (int(fdb["vlan"]),) + mac_decimals(fdb["mac"])
@@ -28,7 +27,7 @@ class FdbUpdater(MIBUpdater):
         self.if_alias_map, \
         self.if_id_map, \
         self.oid_sai_map, \
-        self.oid_name_map = mibs.init_sync_d_interface_tables(self.db_conn)
+        self.oid_name_map = mibs.interface_registry().refresh_interfaces()
 
         ## Note: if if_id_map update, invalid_port_oids should be initialized to empty set
         if self.prev_if_id_map != self.if_id_map:
@@ -45,13 +44,10 @@ class FdbUpdater(MIBUpdater):
         """
         self.db_conn.connect(mibs.ASIC_DB)
         self.vlanmac_ifindex_map = {}
-        self.vlanmac_ifindex_list = []
+        self.vlanmac_ifindex_list = SortedIndex()
 
-        fdb_strings = self.db_conn.keys(mibs.ASIC_DB, "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:*")
-        if not fdb_strings:
-            return
-
-        for s in fdb_strings:
+        vlanmac_ifindex_list = []
+        for s in mibs.scan_keys(self.db_conn, mibs.ASIC_DB, "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:*"):
             fdb_str = s.decode()
             try:
                 fdb = json.loads(fdb_str.split(":", maxsplit=2)[-1])
@@ -59,7 +55,10 @@ class FdbUpdater(MIBUpdater):
                 mibs.logger.error("SyncD 'ASIC_DB' includes invalid FDB_ENTRY '{}': {}.".format(fdb_str, e))
                 break
 
-            ent = self.db_conn.get_all(mibs.ASIC_DB, s, blocking=True)
+            ent = mibs.get_all_within(self.db_conn, mibs.ASIC_DB, s, timeout=0)
+            if not ent:
+                # removed since the SCAN call.
+                continue
             # Example output: oid:0x3a000000000608
             bridge_port_id = ent[b"SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID"][6:]
             if bridge_port_id not in self.if_bpid_map:
@@ -68,18 +67,14 @@ class FdbUpdater(MIBUpdater):
 
             vlanmac = fdb_vlanmac(fdb)
             self.vlanmac_ifindex_map[vlanmac] = mibs.get_index(self.if_id_map[port_id])
-            self.vlanmac_ifindex_list.append(vlanmac)
-        self.vlanmac_ifindex_list.sort()
+            vlanmac_ifindex_list.append(vlanmac)
+        self.vlanmac_ifindex_list = SortedIndex(vlanmac_ifindex_list)
 
     def fdb_ifindex(self, sub_id):
         return self.vlanmac_ifindex_map.get(sub_id, None)
 
     def get_next(self, sub_id):
-        right = bisect_right(self.vlanmac_ifindex_list, sub_id)
-        if right >= len(self.vlanmac_ifindex_list):
-            return None
-
-        return self.vlanmac_ifindex_list[right]
+        return self.vlanmac_ifindex_list.get_next(sub_id)
 
 class QBridgeMIBObjects(metaclass=MIBMeta, prefix='.1.3.6.1.2.1.17.7.1'):
     """
@@ -0,0 +1,209 @@
+"""
+Minimal asyncio Redis client (RESP2 protocol, https://redis.io/topics/protocol).
+
+Commands are pipelined: a batch is written in one go and its replies read back in order. Connections are kept in a
+small pool per database, so several coroutines can have requests in flight without opening a socket each.
+"""
+
+import asyncio
+
+"""
+Most connections a RespPool opens to its database.
+"""
+DEFAULT_POOL_SIZE = 4
+
+"""
+Longest wait (in seconds) to connect, or for the replies to a pipeline. A connection that times out is closed.
+"""
+DEFAULT_TIMEOUT = 5
+
+
+class RespError(Exception):
+    """
+    Error reply from the server.
+    """
+    pass
+
+
+def encode_command(*args):
+    """
+    :param args: command name and arguments (bytes, str or int).
+    :return: the command as a RESP array of bulk strings.
+    """
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode('utf-8')
+        elif isinstance(arg, int):
+            arg = b'%d' % arg
+        parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+    return b''.join(parts)
+
+
+async def read_reply(reader):
+    """
+    :param reader: asyncio.StreamReader
+    :return: the next reply. Error replies are returned (not raised) as RespError, so the rest of a pipeline can
+    still be read.
+    """
+    line = await reader.readline()
+    if not line.endswith(b'\r\n'):
+        raise ConnectionError("Connection closed by the Redis server.")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b'+':
+        return payload
+    if kind == b'-':
+        return RespError(payload.decode('utf-8', 'replace'))
+    if kind == b':':
+        return int(payload)
+    if kind == b'$':
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b'*':
+        length = int(payload)
+        if length < 0:
+            return None
+        items = []
+        for _ in range(length):
+            items.append(await read_reply(reader))
+        return items
+    raise ConnectionError("Unexpected reply from the Redis server: {!r}".format(line))
+
+
+class RespConnection:
+    """
+    A single connection to a Redis database.
+    """
+
+    def __init__(self, reader, writer, timeout=DEFAULT_TIMEOUT):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+
+    @classmethod
+    async def open(cls, db=0, unix_socket_path=None, host='localhost', port=6379, timeout=DEFAULT_TIMEOUT):
+        """
+        Connects over the unix socket if one is given, over TCP otherwise, then selects 'db'.
+        :param timeout: longest wait (in seconds) to connect, then for the replies to each pipeline.
+        :raises asyncio.TimeoutError: if the server does not accept the connection in time.
+        """
+        if unix_socket_path is not None:
+            connect = asyncio.open_unix_connection(unix_socket_path)
+        else:
+            connect = asyncio.open_connection(host, port)
+        reader, writer = await asyncio.wait_for(connect, timeout)
+        connection = cls(reader, writer, timeout)
+        if db:
+            try:
+                await connection.execute('SELECT', db)
+            except BaseException:
+                connection.close()
+                raise
+        return connection
+
+    async def pipeline(self, commands):
+        """
+        :param commands: iterable of commands, each a tuple of arguments (see encode_command).
+        :return: list of replies, in the order of the commands. Error replies are RespError instances.
+        :raises asyncio.TimeoutError: if the replies do not all arrive within the timeout. The connection is closed,
+        since later replies could no longer be matched to their commands.
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        try:
+            self.writer.write(b''.join(encode_command(*command) for command in commands))
+            return await asyncio.wait_for(self._read_replies(len(commands)), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _read_replies(self, count):
+        await self.writer.drain()
+        replies = []
+        for _ in range(count):
+            replies.append(await read_reply(self.reader))
+        return replies
+
+    async def execute(self, *args):
+        """
+        :return: the reply to a single command.
+        :raises RespError: on an error reply.
+        """
+        reply = (await self.pipeline([args]))[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def close(self):
+        self.writer.close()
+
+
+class RespPool:
+    """
+    Pool of up to 'size' connections to one database. Connections are opened on demand and reused; one that fails
+    mid-command is dropped, since its replies can no longer be matched to requests.
+    """
+
+    def __init__(self, db=0, size=DEFAULT_POOL_SIZE, **connection_kwargs):
+        """
+        :param db: database number.
+        :param size: most connections open at once. Callers beyond that wait for a connection to be released.
+        :param connection_kwargs: 'unix_socket_path', or 'host' and 'port', and 'timeout' (see RespConnection.open).
+        """
+        self.db = db
+        self.size = size
+        self.connection_kwargs = connection_kwargs
+        self.idle = []
+        # created on first use, on the loop that uses the pool.
+        self.semaphore = None
+
+    async def acquire(self):
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.size)
+        await self.semaphore.acquire()
+        try:
+            if self.idle:
+                return self.idle.pop()
+            return await RespConnection.open(self.db, **self.connection_kwargs)
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+    def release(self, connection, discard=False):
+        if discard:
+            connection.close()
+        else:
+            self.idle.append(connection)
+        self.semaphore.release()
+
+    async def pipeline(self, commands):
+        """
+        Runs the commands over one pooled connection. See RespConnection.pipeline.
+        """
+        connection = await self.acquire()
+        try:
+            replies = await connection.pipeline(commands)
+        except BaseException:
+            self.release(connection, discard=True)
+            raise
+        self.release(connection)
+        return replies
+
+    async def execute(self, *args):
+        """
+        See RespConnection.execute.
+        """
+        reply = (await self.pipeline([args]))[0]
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def close(self):
+        """
+        Closes the idle connections.
+        """
+        while self.idle:
+            self.idle.pop().close()
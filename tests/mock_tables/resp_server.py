@@ -0,0 +1,79 @@
+"""
+In-process stand-in for the Redis server: serves the mock tables (see dbconnector) over a unix socket, speaking
+enough RESP for sonic_ax_impl.resp.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+
+from tests.mock_tables.dbconnector import SwssSyncClient
+from sonic_ax_impl.resp import read_reply
+
+
+def encode_reply(value):
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, (list, tuple)):
+        return b'*%d\r\n' % len(value) + b''.join(encode_reply(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+class MockRespServer:
+    def __init__(self):
+        self.databases = {}
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'redis.sock')
+        self.server = None
+        self.handlers = set()
+        # number of connections accepted.
+        self.connections = 0
+
+    def database(self, db):
+        if db not in self.databases:
+            self.databases[db] = SwssSyncClient(db=db)
+        return self.databases[db]
+
+    async def start(self):
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+
+    async def stop(self):
+        """
+        Waits for the clients to disconnect, then shuts down.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        if self.handlers:
+            await asyncio.wait(self.handlers)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    async def handle(self, reader, writer):
+        self.handlers.add(asyncio.current_task())
+        self.connections += 1
+        db = 0
+        while True:
+            try:
+                command = await read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                break
+            name, args = command[0].upper(), command[1:]
+            client = self.database(db)
+            if name == b'SELECT':
+                db = int(args[0])
+                reply = b'+OK\r\n'
+            elif name == b'PING':
+                reply = b'+PONG\r\n'
+            elif name == b'KEYS':
+                reply = encode_reply(client.keys(args[0]))
+            elif name == b'HGETALL':
+                reply = encode_reply([item for pair in client.hgetall(args[0]).items() for item in pair])
+            elif name == b'HMGET':
+                reply = encode_reply([client.hget(args[0], field) for field in args[1:]])
+            else:
+                reply = b"-ERR unknown command '" + name + b"'\r\n"
+            writer.write(reply)
+        writer.close()
@@ -4,8 +4,367 @@ import sys
 modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(modules_path, 'src'))
 
+import asyncio
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
-from ax_interface import MIBMeta, ValueType
+
+from ax_interface import MIBMeta, MIBUpdater, MIBEntry, SubtreeMIBEntry, ValueType
+from ax_interface.mib import PackedIndex, PrefixIndex, SortedIndex, MIBTable
+from ax_interface.encodings import ObjectIdentifier, SearchRange, ValueRepresentation, EncodedValueRepresentation
+
+
+class TestPrefixIndex(TestCase):
+    def setUp(self):
+        self.index = PrefixIndex([
+            (1, 2, 3, 5),
+            (1, 2),
+            (1, 2, 3, 5, 1),
+            (1, 4),
+        ])
+
+    def test_parent_links(self):
+        self.assertEqual(self.index.oids, [(1, 2), (1, 2, 3, 5), (1, 2, 3, 5, 1), (1, 4)])
+        self.assertEqual(self.index.parents, [-1, 0, 1, -1])
+
+    def test_find_parent(self):
+        self.assertEqual(self.index.find_parent((1, 2, 3, 5, 1, 7)), (1, 2, 3, 5, 1))
+        self.assertEqual(self.index.find_parent((1, 2, 3, 5, 2)), (1, 2, 3, 5))
+        self.assertEqual(self.index.find_parent((1, 2)), (1, 2))
+        # closest predecessor (1, 2, 3, 5, 1) is not a prefix, but its ancestor (1, 2) is.
+        self.assertEqual(self.index.find_parent((1, 2, 4)), (1, 2))
+        self.assertIsNone(self.index.find_parent((1, 3)))
+        self.assertIsNone(self.index.find_parent((0,)))
+
+    def test_successor_index(self):
+        self.assertEqual(self.index.successor_index((1, 2)), 1)
+        self.assertEqual(self.index.successor_index((1, 2, 4)), 3)
+        self.assertEqual(self.index.successor_index((2,)), 4)
+
+
+class RowUpdater(MIBUpdater):
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+
+    def update_data(self):
+        pass
+
+    def get_next(self, sub_id):
+        right = bisect.bisect_right(self.rows, sub_id)
+        if right >= len(self.rows):
+            return None
+        return self.rows[right]
+
+
+class TestSortedIndex(TestCase):
+    def test_index(self):
+        index = SortedIndex([(5,), (1,), (3,), (1,)])
+
+        self.assertEqual(list(index), [(1,), (3,), (5,)])
+        self.assertEqual(len(index), 3)
+        self.assertIn((3,), index)
+        self.assertNotIn((2,), index)
+        self.assertEqual(index.get_next(()), (1,))
+        self.assertEqual(index.get_next((3,)), (5,))
+        self.assertEqual(index.get_next((4, 1)), (5,))
+        self.assertIsNone(index.get_next((5,)))
+
+    def test_add_discard(self):
+        index = SortedIndex([(1,), (5,)])
+
+        index.add((3,))
+        index.add((3,))
+        index.discard((1,))
+        index.discard((7,))
+
+        self.assertEqual(list(index), [(3,), (5,)])
+        self.assertNotIn((1,), index)
+        self.assertEqual(index.get_next((1,)), (3,))
+
+
+class TestPackedIndex(TestCase):
+    def test_index(self):
+        index = PackedIndex(3, [(10, 0, 1), (10, 0, 0), (192, 168, 0), (10, 0, 1)])
+
+        self.assertEqual(list(index), [(10, 0, 0), (10, 0, 1), (192, 168, 0)])
+        self.assertIn((10, 0, 1), index)
+        self.assertNotIn((10, 0), index)
+        self.assertNotIn((10, 0, 256), index)
+        self.assertEqual(index.get_next(()), (10, 0, 0))
+        self.assertEqual(index.get_next((10, 0)), (10, 0, 0))
+        self.assertEqual(index.get_next((10, 0, 0)), (10, 0, 1))
+        self.assertEqual(index.get_next((10, 0, 0, 5)), (10, 0, 1))
+        # sub-ids past an octet sort after every row with the same prefix.
+        self.assertEqual(index.get_next((10, 300)), (192, 168, 0))
+        self.assertEqual(index.get_next((10, 0, 1000, 1)), (192, 168, 0))
+        self.assertIsNone(index.get_next((256,)))
+        self.assertIsNone(index.get_next((192, 168, 0)))
+
+    def test_update(self):
+        keys = [(i // 256, i % 256) for i in range(1000)]
+        index = PackedIndex(2, keys[::2])
+
+        # one at a time...
+        index.update(added=[(0, 1), (0, 3)], removed=[(0, 0), (9, 9)])
+        self.assertEqual(index[:3], [(0, 1), (0, 2), (0, 3)])
+        # ...and in bulk.
+        index.update(added=keys[501::2], removed=keys[:500])
+        self.assertEqual(list(index), keys[500:])
+        self.assertEqual(len(index.members), 500)
+
+
+class TestPopulatedSubtrees(TestCase):
+    materialize = False
+
+    def setUp(self):
+        updater = RowUpdater()
+
+        class RowMIB(metaclass=MIBMeta, prefix='.1.3.6.1.4.1.99999'):
+            row_updater = updater
+
+            first = SubtreeMIBEntry('1', updater, ValueType.INTEGER, lambda sub_id: sub_id[0])
+            second = SubtreeMIBEntry('2', updater, ValueType.INTEGER, lambda sub_id: sub_id[0])
+            last = MIBEntry('3', ValueType.INTEGER, lambda: 42)
+
+        self.updater = updater
+        self.lut = MIBTable(RowMIB, materialize=self.materialize)
+
+    def get_next(self, *subids):
+        oid = ObjectIdentifier(len(subids), 0, 0, 0, subids)
+        return self.lut.get_next(SearchRange(start=oid, end=ObjectIdentifier.null_oid()))
+
+    def test_empty_subtrees_skipped(self):
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 3))
+        self.assertEqual(vr.data, 42)
+
+    def test_refresh_updates_bitmap(self):
+        self.updater.rows = [(7,)]
+        self.updater.refreshed()
+        self.assertEqual(self.updater.generation, 1)
+
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 7))
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999, 1, 7)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 2, 7))
+
+        self.updater.rows = []
+        self.updater.refreshed()
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 3))
+
+
+class TestMaterializedSubtrees(TestPopulatedSubtrees):
+    materialize = True
+
+    def test_generation_swap(self):
+        self.updater.rows = [(7,)]
+        self.updater.refreshed()
+        views = self.lut._views
+
+        # the view only changes on refresh.
+        self.updater.rows = [(7,), (8,)]
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999, 1, 7)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 2, 7))
+
+        self.updater.refreshed()
+        self.assertIsNot(self.lut._views, views)
+        self.assertEqual(self.lut._views[self.updater].generation, 2)
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999, 1, 7)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 8))
+
+
+class TestVarBindCache(TestCase):
+    def setUp(self):
+        updater = RowUpdater()
+        updater.rows = [(7,), (8,)]
+        self.calls = calls = []
+
+        def row_value(sub_id):
+            calls.append(sub_id)
+            return sub_id[0]
+
+        class RowMIB(metaclass=MIBMeta, prefix='.1.3.6.1.4.1.99999'):
+            row_updater = updater
+
+            first = SubtreeMIBEntry('1', updater, ValueType.INTEGER, row_value)
+
+        self.updater = updater
+        self.lut = MIBTable(RowMIB)
+
+    def walk(self):
+        oid = ObjectIdentifier(7, 0, 0, 0, (1, 3, 6, 1, 4, 1, 99999))
+        return list(self.lut.walk(SearchRange(start=oid, end=ObjectIdentifier.null_oid())))
+
+    def test_cached_until_refresh(self):
+        first = self.walk()
+        self.assertEqual(len(self.calls), 2)
+        self.assertIsInstance(first[0], EncodedValueRepresentation)
+
+        # same generation: served from the cache.
+        second = self.walk()
+        self.assertEqual(len(self.calls), 2)
+        self.assertIs(first[0], second[0])
+
+        self.updater.refreshed()
+        third = self.walk()
+        self.assertEqual(len(self.calls), 4)
+        self.assertIsNot(first[0], third[0])
+
+    def test_encoded_bytes(self):
+        vr = self.walk()[0]
+        for endianness in ('!', '<'):
+            self.assertEqual(vr.to_bytes(endianness), ValueRepresentation(*vr).to_bytes(endianness))
+            self.assertIn(endianness, vr.encoded)
+        self.assertEqual(vr.size, len(vr.encoded['!']))
+
+
+class TestWalkCursor(TestCase):
+    setUp = TestVarBindCache.setUp
+
+    def get_next(self, oid, session_id=1):
+        return self.lut.get_next(SearchRange(start=oid, end=ObjectIdentifier.null_oid()), session_id)
+
+    def test_sequential_hits(self):
+        vr = self.get_next(ObjectIdentifier(7, 0, 0, 0, (1, 3, 6, 1, 4, 1, 99999)))
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 7))
+        self.assertEqual((self.lut.cursor_hits, self.lut.cursor_misses), (0, 1))
+
+        vr = self.get_next(vr.name)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 8))
+        self.assertEqual((self.lut.cursor_hits, self.lut.cursor_misses), (1, 1))
+
+        # another session starts its own walk.
+        vr = self.get_next(vr.name, session_id=2)
+        self.assertEqual(vr.type_, ValueType.END_OF_MIB_VIEW)
+        self.assertEqual((self.lut.cursor_hits, self.lut.cursor_misses), (1, 2))
+
+    def test_invalidated_by_refresh(self):
+        vr = self.get_next(ObjectIdentifier(7, 0, 0, 0, (1, 3, 6, 1, 4, 1, 99999)))
+        self.updater.rows = [(7,), (7, 5), (8,)]
+        self.updater.refreshed()
+
+        vr = self.get_next(vr.name)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 7, 5))
+        self.assertEqual((self.lut.cursor_hits, self.lut.cursor_misses), (0, 2))
+
+    def test_kept_across_other_refresh(self):
+        updater, other = RowUpdater(), RowUpdater()
+        updater.rows = [(7,), (8,)]
+
+        class TwoUpdaterMIB(metaclass=MIBMeta, prefix='.1.3.6.1.4.1.99999'):
+            row_updater = updater
+            other_updater = other
+
+            first = SubtreeMIBEntry('1', updater, ValueType.INTEGER, lambda sub_id: sub_id[0])
+            second = SubtreeMIBEntry('2', other, ValueType.INTEGER, lambda sub_id: sub_id[0])
+
+        self.lut = MIBTable(TwoUpdaterMIB)
+        vr = self.get_next(ObjectIdentifier(7, 0, 0, 0, (1, 3, 6, 1, 4, 1, 99999)))
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 7))
+
+        # a refresh of another updater keeps the cursor...
+        other.rows = [(3,)]
+        other.refreshed()
+        vr = self.get_next(vr.name)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 8))
+        self.assertEqual((self.lut.cursor_hits, self.lut.cursor_misses), (1, 1))
+        # ...and the walk reaches its subtree as of the refresh.
+        vr = self.get_next(vr.name)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 2, 3))
+        self.assertEqual((self.lut.cursor_hits, self.lut.cursor_misses), (2, 1))
+
+
+class SnapshotUpdater(RowUpdater):
+    def __init__(self):
+        super().__init__()
+        self.update_threads = []
+        self.rows_during_update = None
+
+    def reinit_data(self):
+        self.rows = [(1,)]
+
+    def update_data(self):
+        # the published state is untouched while the new one is built.
+        self.rows_during_update = self.published.rows
+        self.rows = self.rows + [(2,)]
+        self.update_threads.append(threading.current_thread())
+
+
+class SourceUpdater(RowUpdater):
+    def __init__(self):
+        super().__init__()
+        self.source = []
+        self.updates = 0
+
+    def update_data(self):
+        self.updates += 1
+        self.rows = list(self.source)
+
+
+class TestDormantUpdater(TestCase):
+    def setUp(self):
+        updater = SourceUpdater()
+
+        class RowMIB(metaclass=MIBMeta, prefix='.1.3.6.1.4.1.99999'):
+            row_updater = updater
+
+            first = SubtreeMIBEntry('1', updater, ValueType.INTEGER, lambda sub_id: sub_id[0])
+            last = MIBEntry('3', ValueType.INTEGER, lambda: 42)
+
+        self.updater = updater
+        self.lut = MIBTable(RowMIB, idle_timeout=60)
+        # handed over by start_background_tasks()
+        updater.idle_timeout = 60
+
+    def get_next(self, *subids):
+        oid = ObjectIdentifier(len(subids), 0, 0, 0, subids)
+        return self.lut.get_next(SearchRange(start=oid, end=ObjectIdentifier.null_oid()))
+
+    def test_active(self):
+        self.updater.source = [(7,)]
+        self.assertFalse(self.updater.dormant)
+        # not refreshed by the query: still empty.
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 3))
+        self.assertEqual(self.updater.updates, 0)
+
+    def test_woken_by_query(self):
+        self.updater.source = [(7,)]
+        self.updater.last_access -= 61
+        self.assertTrue(self.updater.dormant)
+
+        # the (stale) empty subtree is visited, which wakes the updater up.
+        vr = self.get_next(1, 3, 6, 1, 4, 1, 99999)
+        self.assertEqual(vr.name.to_tuple(), (1, 3, 6, 1, 4, 1, 99999, 1, 7))
+        self.assertEqual(self.updater.updates, 1)
+        self.assertEqual(self.updater.generation, 1)
+        self.assertFalse(self.updater.dormant)
+
+
+class TestUpdateOffLoop(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.updater = SnapshotUpdater()
+        self.updater.published = self.updater
+        self.updater.executor = ThreadPoolExecutor(max_workers=1)
+
+    def tearDown(self):
+        self.updater.executor.shutdown()
+        self.loop.close()
+
+    def test_swap(self):
+        rows = self.updater.rows
+        self.loop.run_until_complete(self.updater.update_off_loop(reinit=True))
+
+        self.assertIsNot(self.updater.update_threads[0], threading.current_thread())
+        self.assertIs(self.updater.rows_during_update, rows)
+        self.assertEqual(self.updater.rows, [(1,), (2,)])
+        # state that was not rebound is kept.
+        self.assertIs(self.updater.published, self.updater)
+        self.assertIsNotNone(self.updater.executor)
 
 
 # class TestMIB(TestCase):
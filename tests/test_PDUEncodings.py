@@ -6,7 +6,7 @@ sys.path.insert(0, os.path.join(modules_path, 'src'))
 import struct
 from unittest import TestCase
 from ax_interface.encodings import ObjectIdentifier, OctetString, SearchRange, ValueRepresentation
-from ax_interface import constants
+from ax_interface import codec, constants
 
 
 class TestPDUEncodings(TestCase):
@@ -108,3 +108,57 @@ class TestPDUEncodings(TestCase):
                                                        subids=(1, 6027, 3, 10, 1, 2, 9)), data=None)
         self.assertEqual(ValueRepresentation.from_bytes(vr.to_bytes('!'), '!'), vr)  # roundtrip
 
+    def test_value_representation_types(self):
+        name = (1, 3, 6, 1, 2, 1, 2, 2, 1, 10, 1)
+        values = {
+            constants.ValueType.INTEGER: 42,
+            constants.ValueType.OCTET_STRING: 'Ethernet0',
+            constants.ValueType.NULL: None,
+            constants.ValueType.OBJECT_IDENTIFIER: (1, 3, 6, 1, 4, 1, 6027),
+            constants.ValueType.IP_ADDRESS: b'\x0a\x00\x00\x01',
+            constants.ValueType.COUNTER_32: 2 ** 32 - 1,
+            constants.ValueType.GAUGE_32: 40000,
+            constants.ValueType.TIME_TICKS: 0,
+            constants.ValueType.OPAQUE: b'\x00',
+            constants.ValueType.COUNTER_64: 2 ** 64 - 1,
+            constants.ValueType.NO_SUCH_OBJECT: None,
+            constants.ValueType.NO_SUCH_INSTANCE: None,
+            constants.ValueType.END_OF_MIB_VIEW: None,
+        }
+        self.assertEqual(set(values), set(constants.ValueType))
+        for value_type, data in values.items():
+            vr = ValueRepresentation.from_typecast(value_type, name, data)
+            for endianness in ('!', '<'):
+                encoded = vr.to_bytes(endianness)
+                self.assertEqual(len(encoded), vr.size)
+                decoded = ValueRepresentation.from_bytes(encoded, endianness)
+                self.assertEqual(decoded, vr)
+                self.assertIs(decoded.type_, value_type)
+
+        with self.assertRaises(ValueError):
+            ValueRepresentation.from_typecast(3, name, None)
+
+    def test_codec_cache(self):
+        # interface/route table OIDs are compiled at import.
+        for n_subid in range(10, 25):
+            self.assertIn(('!', n_subid), codec.OID)
+            self.assertIn(('<', n_subid), codec.OID)
+
+        long_oid = ObjectIdentifier.from_iterable(tuple(range(1, 41)))
+        for endianness in codec.ENDIANNESSES:
+            encoded = long_oid.to_bytes(endianness)
+            self.assertEqual(ObjectIdentifier.from_bytes(encoded, endianness), long_oid)
+            self.assertIs(codec.OID[endianness, len(long_oid.subids)], codec.OID[endianness, len(long_oid.subids)])
+
+        buffer = bytearray(8)
+        end = codec.pack_octet_string_into(buffer, 0, '<', 3, b'abc', b'')
+        self.assertEqual(end, 8)
+        self.assertEqual(codec.unpack_octet_string_from(buffer, '<'), (3, b'abc', b'\x00'))
+
+        # lengths picked by the peer do not grow the cache past the bound.
+        length = codec.MAX_CACHED_OCTET_STRING_LENGTH + 2
+        buffer = bytearray(4 + length + 3)
+        codec.pack_octet_string_into(buffer, 0, '!', length, b'x' * length, b'\x00' * 3)
+        self.assertEqual(codec.unpack_octet_string_from(buffer, '!'), (length, b'x' * length, b'\x00' * 3))
+        self.assertIn(('<', 3), codec.OCTET_STRING)
+        self.assertNotIn(('!', length), codec.OCTET_STRING)
@@ -7,11 +7,12 @@ sys.path.insert(0, os.path.join(modules_path, 'src'))
 import struct
 import pprint
 from unittest import TestCase
-from ax_interface.pdu import PDU, PDUHeader, PDUHeaderTags, supported_pdus, ContextOptionalPDU, _ignored_pdus, PDUStream
-from ax_interface.pdu_implementations import OpenPDU, ResponsePDU, RegisterPDU, GetPDU
-from ax_interface import exceptions
-from ax_interface.encodings import ObjectIdentifier
-from ax_interface.constants import PduTypes
+from ax_interface.pdu import PDU, PDUHeader, PDUHeaderTags, supported_pdus, ContextOptionalPDU, _ignored_pdus, PDUStream, \
+    PDUFramer
+from ax_interface.pdu_implementations import OpenPDU, ResponsePDU, RegisterPDU, GetPDU, GetBulkPDU
+from ax_interface import constants, exceptions
+from ax_interface.encodings import ObjectIdentifier, ValueRepresentation
+from ax_interface.constants import PduTypes, ValueType
 from ax_interface.mib import MIBTable
 from sonic_ax_impl.mibs.vendor.dell import force10
 
@@ -128,6 +129,27 @@ class TestResponsePDU(TestCase):
         self.assertEqual(response_pdu, decoded)
         print(response_pdu)
 
+    def test_payload_length_backpatch(self):
+        response_pdu = ResponsePDU(
+            header=PDUHeader(1, 18, 16, 0, 42, 0, 0, 0),
+            sys_up_time=0,
+            error=0,
+            index=0,
+            values=[
+                ValueRepresentation.from_typecast(ValueType.OCTET_STRING, (1, 3, 6, 1, 2, 1, 1, 1, 0), 'SONiC'),
+                ValueRepresentation.from_typecast(ValueType.COUNTER_64, (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 6, 1), 2 ** 40),
+            ]
+        )
+        expected_length = response_pdu.payload_length
+        # a stale header length must not leak into the encoded PDU
+        response_pdu.header = response_pdu.header._replace(payload_length=0)
+
+        encoded = response_pdu.encode()
+        self.assertEqual(len(encoded), 20 + expected_length)
+        decoded = PDU.decode(encoded)
+        self.assertEqual(decoded.header.payload_length, expected_length)
+        self.assertEqual(decoded.values, response_pdu.values)
+
 
 class TestRegisterPDU(TestCase):
     def test_roundtrip(self):
@@ -214,6 +236,54 @@ class TestRegisterPDU(TestCase):
             self.failIf('pdu' not in locals())
 
 
+class TestPDUFramer(TestCase):
+    # two consecutive response PDUs (see TestResponsePDU.test_register_interfaces)
+    stream = b'\x01\x12\x10\x00\x00\x00\x00M\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00,\x01\xcdL{\x00\x00\x00\x00' \
+             b'\x00\x05\x00\x00\x07\x04\x00\x00\x00\x00\x00\x01\x00\x00\x17\x8b\x00\x00\x00\x03\x00\x00\x00\n\x00' \
+             b'\x00\x00\x01\x00\x00\x00\x02\x00\x00\x00\t\x01\x12\x10\x00\x00\x00\x00M\x00\x00\x00\x00\x00\x00' \
+             b'\x00\x00\x00\x00\x00\x18\x01\xcdL|\x00\x00\x00\x00\x00\x05\x00\x00\x02\x02\x00\x00\x00\x00\x00' \
+             b'\x01\x00\x00\x00\x02'
+
+    def test_coalesced(self):
+        frames = PDUFramer().feed(self.stream)
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(b''.join(frames), self.stream)
+        pdus = [PDU.decode(frame) for frame in frames]
+        self.assertTrue(all(isinstance(pdu, ResponsePDU) for pdu in pdus))
+        self.assertEqual(len(pdus[0].values), 1)
+        self.assertEqual(len(pdus[1].values), 1)
+
+    def test_split(self):
+        expected = [PDU.decode(frame) for frame in PDUFramer().feed(self.stream)]
+        for split in range(1, len(self.stream)):
+            framer = PDUFramer()
+            frames = framer.feed(self.stream[:split])
+            frames += framer.feed(self.stream[split:])
+            self.assertEqual([PDU.decode(frame) for frame in frames], expected)
+
+    def test_byte_at_a_time(self):
+        framer = PDUFramer()
+        frames = []
+        for i in range(len(self.stream)):
+            frames += framer.feed(self.stream[i:i + 1])
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(b''.join(frames), self.stream)
+
+    def test_truncated_decode(self):
+        with self.assertRaises(exceptions.PDUUnpackError):
+            PDU.decode(self.stream[:40])
+
+    def test_oversized_payload_length(self):
+        header = PDUHeader(1, PduTypes.RESPONSE, PDUHeader.MASK_NEWORK_BYTE_ORDER, 0, 0, 0, 0,
+                           constants.AGENTX_MAX_PAYLOAD_LENGTH + 1)
+        framer = PDUFramer()
+        self.assertEqual(framer.feed(header.to_bytes()[:10]), [])
+        with self.assertRaises(exceptions.PDUUnpackError):
+            framer.feed(header.to_bytes()[10:])
+        # nothing buffered--a new stream frames from scratch.
+        self.assertEqual(b''.join(framer.feed(self.stream)), self.stream)
+
+
 class TestGetPDU(TestCase):
     def test_roundtrip(self):
         get_pdu = GetPDU(
@@ -233,6 +303,28 @@ class TestGetPDU(TestCase):
         print(get_pdu)
 
 
+class TestGetBulkPDU(TestCase):
+    def test_roundtrip(self):
+        get_bulk_pdu = GetBulkPDU(
+            header=PDUHeader(1, PduTypes.GET_BULK, 16, 0, 42, 0, 0, 0),
+            non_repeaters=1,
+            max_repetitions=10,
+            oids=(
+                ObjectIdentifier(4, 2, 0, 0, (1, 1, 1, 0)),
+                ObjectIdentifier(4, 2, 0, 0, (2, 2, 2, 0)),
+            )
+        )
+
+        encoded = get_bulk_pdu.encode()
+        decoded = PDU.decode(encoded)
+
+        self.assertEqual(decoded.header.type_, PduTypes.GET_BULK)
+        self.assertIsInstance(decoded, GetBulkPDU)
+        self.assertEqual(decoded.non_repeaters, 1)
+        self.assertEqual(decoded.max_repetitions, 10)
+        self.assertEqual(decoded.sr, get_bulk_pdu.sr)
+
+
 class TestGetNextPDU(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 import ipaddress
 
 modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -15,8 +16,12 @@ from ax_interface.pdu_implementations import GetPDU, GetNextPDU
 from ax_interface import ValueType
 from ax_interface.encodings import ObjectIdentifier
 from ax_interface.constants import PduTypes
+from sonic_ax_impl import mibs
+from sonic_ax_impl.mibs import ieee802_1ab
 from sonic_ax_impl.mibs.ietf import rfc4363
 from sonic_ax_impl.main import SonicMIB
+from sonic_ax_impl.resp import RespPool
+from tests.mock_tables.resp_server import MockRespServer
 
 class TestForwardMIB(TestCase):
     @classmethod
@@ -24,8 +29,21 @@ class TestForwardMIB(TestCase):
         cls.lut = MIBTable(SonicMIB)
 
     def test_update(self):
+        # coroutine updaters (LLDP) read over RESP.
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        server = MockRespServer()
+        loop.run_until_complete(server.start())
+        self.addCleanup(loop.run_until_complete, server.stop())
+        mibs.resp_pools[mibs.APPL_DB] = RespPool(mibs.DATABASES[mibs.APPL_DB], unix_socket_path=server.path)
+        self.addCleanup(mibs.close_resp_pools)
+
         for updater in TestForwardMIB.lut.updater_instances:
-            updater.update_data()
+            if updater.is_coroutine:
+                loop.run_until_complete(updater.update_data())
+            else:
+                updater.update_data()
+        self.assertTrue(ieee802_1ab._lldp_updater.lldp_counters)
 
     def test_network_order(self):
         ip = ipaddress.ip_address("0.1.2.3")
@@ -135,3 +153,28 @@ class TestForwardMIB(TestCase):
         value0 = response.values[0]
         self.assertEqual(value0.type_, ValueType.END_OF_MIB_VIEW)
 
+
+    def test_getnextpdu_columns(self):
+        get_pdu = GetNextPDU(
+            header=PDUHeader(1, PduTypes.GET, 16, 0, 42, 0, 0, 0),
+            oids=(
+                ObjectIdentifier(11, 0, 0, 0, (1, 3, 6, 1, 2, 1, 4, 24, 4, 1, 2)),
+                ObjectIdentifier(11, 0, 0, 0, (1, 3, 6, 1, 2, 1, 4, 24, 4, 1, 3)),
+                ObjectIdentifier(11, 0, 0, 0, (1, 3, 6, 1, 2, 1, 4, 24, 4, 1, 4)),
+            )
+        )
+
+        response = get_pdu.make_response(self.lut)
+        print(response)
+
+        row = '0.0.0.0.0.0.0.0.0.10.0.0.1'
+        mask, tos, nexthop = response.values
+        self.assertEqual(mask.type_, ValueType.IP_ADDRESS)
+        self.assertEqual(str(mask.name), '.1.3.6.1.2.1.4.24.4.1.2.' + row)
+        self.assertEqual(str(mask.data), ipaddress.ip_address("0.0.0.0").packed.decode())
+        self.assertEqual(tos.type_, ValueType.INTEGER)
+        self.assertEqual(str(tos.name), '.1.3.6.1.2.1.4.24.4.1.3.' + row)
+        self.assertEqual(tos.data, 0)
+        self.assertEqual(nexthop.type_, ValueType.IP_ADDRESS)
+        self.assertEqual(str(nexthop.name), '.1.3.6.1.2.1.4.24.4.1.4.' + row)
+        self.assertEqual(str(nexthop.data), ipaddress.ip_address("10.0.0.1").packed.decode())
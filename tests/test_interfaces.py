@@ -10,9 +10,9 @@ sys.path.insert(0, os.path.join(modules_path, 'src'))
 from unittest import TestCase
 
 from ax_interface import ValueType
-from ax_interface.pdu_implementations import GetPDU, GetNextPDU
-from ax_interface.encodings import ObjectIdentifier
-from ax_interface.constants import PduTypes
+from ax_interface.pdu_implementations import GetPDU, GetNextPDU, GetBulkPDU
+from ax_interface.encodings import ObjectIdentifier, SearchRange
+from ax_interface.constants import PduTypes, SNMP_MAX_MSG_SIZE
 from ax_interface.pdu import PDU, PDUHeader
 from ax_interface.mib import MIBTable
 from sonic_ax_impl.mibs.ietf import rfc1213
@@ -132,3 +132,116 @@ class TestGetNextPDU(TestCase):
         pdu = PDU.decode(resp)
         resp = pdu.make_response(self.lut)
         print(resp)
+
+
+class TestGetBulkPDU(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lut = MIBTable(rfc1213.InterfacesMIB)
+
+    def _get_next_walk(self, oid, count):
+        names = []
+        for _ in range(count):
+            vr = self.lut.get_next(SearchRange(start=oid, end=ObjectIdentifier.null_oid()))
+            if vr.type_ == ValueType.END_OF_MIB_VIEW:
+                break
+            names.append(str(vr.name))
+            oid = vr.name
+        return names
+
+    def test_getbulk_matches_getnext(self):
+        oid = ObjectIdentifier(10, 0, 0, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1))
+        get_pdu = GetBulkPDU(
+            header=PDUHeader(1, PduTypes.GET_BULK, 16, 0, 42, 0, 0, 0),
+            max_repetitions=10,
+            oids=[oid]
+        )
+
+        response = get_pdu.make_response(self.lut)
+        self.assertEqual(len(response.values), 10)
+        self.assertEqual([str(vr.name) for vr in response.values], self._get_next_walk(oid, 10))
+
+    def test_getbulk_non_repeaters(self):
+        if_number = ObjectIdentifier(8, 0, 1, 0, (1, 3, 6, 1, 2, 1, 2, 1))
+        if_index = ObjectIdentifier(10, 0, 0, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1))
+        get_pdu = GetBulkPDU(
+            header=PDUHeader(1, PduTypes.GET_BULK, 16, 0, 42, 0, 0, 0),
+            non_repeaters=1,
+            max_repetitions=3,
+            oids=[if_number, if_index]
+        )
+
+        response = get_pdu.make_response(self.lut)
+        self.assertEqual(len(response.values), 4)
+        self.assertEqual(response.values[0].type_, ValueType.INTEGER)
+        self.assertEqual(str(response.values[0].name), str(if_number))
+        self.assertEqual([str(vr.name) for vr in response.values[1:]], self._get_next_walk(if_index, 3))
+
+    def test_getbulk_end_of_mib_view(self):
+        oid = ObjectIdentifier(5, 0, 0, 0, (1, 3, 6, 1, 3))
+        get_pdu = GetBulkPDU(
+            header=PDUHeader(1, PduTypes.GET_BULK, 16, 0, 42, 0, 0, 0),
+            max_repetitions=5,
+            oids=[oid]
+        )
+
+        response = get_pdu.make_response(self.lut)
+        # repetitions stop once every repeater is exhausted.
+        self.assertEqual(len(response.values), 1)
+        self.assertEqual(response.values[0].type_, ValueType.END_OF_MIB_VIEW)
+        self.assertEqual(str(response.values[0].name), str(oid))
+
+    def test_getbulk_max_msg_size(self):
+        oid = ObjectIdentifier(10, 0, 0, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1))
+        get_pdu = GetBulkPDU(
+            header=PDUHeader(1, PduTypes.GET_BULK, 16, 0, 42, 0, 0, 0),
+            max_repetitions=1000,
+            oids=[oid]
+        )
+
+        response = get_pdu.make_response(self.lut)
+        self.assertLess(len(response.values), 1000)
+        self.assertLessEqual(len(response.encode()), SNMP_MAX_MSG_SIZE)
+
+    def test_getbulk_max_msg_size_whole_repetitions(self):
+        if_index = ObjectIdentifier(10, 0, 0, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1))
+        if_descr = ObjectIdentifier(10, 0, 0, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 2))
+        if_type = ObjectIdentifier(10, 0, 0, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 3))
+        get_pdu = GetBulkPDU(
+            header=PDUHeader(1, PduTypes.GET_BULK, 16, 0, 42, 0, 0, 0),
+            non_repeaters=1,
+            max_repetitions=1000,
+            oids=[if_index, if_descr, if_type]
+        )
+
+        response = get_pdu.make_response(self.lut)
+        self.assertLessEqual(len(response.encode()), SNMP_MAX_MSG_SIZE)
+        # the non-repeater, then only whole repetitions.
+        self.assertEqual((len(response.values) - 1) % 2, 0)
+        self.assertTrue(str(response.values[-2].name).startswith('.1.3.6.1.2.1.2.2.1.2.'))
+        self.assertTrue(str(response.values[-1].name).startswith('.1.3.6.1.2.1.2.2.1.3.'))
+
+
+class TestMaterializedView(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lut = MIBTable(rfc1213.InterfacesMIB)
+        cls.materialized_lut = MIBTable(rfc1213.InterfacesMIB, materialize=True)
+
+    def test_walk_matches(self):
+        oid = ObjectIdentifier(6, 0, 0, 0, (1, 3, 6, 1, 2, 1))
+        sr = SearchRange(start=oid, end=ObjectIdentifier.null_oid())
+        expected = [(str(vr.name), vr.type_, vr.data) for vr in self.lut.walk(sr)]
+        actual = [(str(vr.name), vr.type_, vr.data) for vr in self.materialized_lut.walk(sr)]
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(actual, expected)
+
+    def test_get(self):
+        oid = ObjectIdentifier(11, 0, 1, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 1))
+        vr = self.materialized_lut.get(SearchRange(start=oid, end=oid.inc()))
+        self.assertEqual(vr.type_, ValueType.INTEGER)
+        self.assertEqual(vr.data, self.lut.get(SearchRange(start=oid, end=oid.inc())).data)
+
+        oid = ObjectIdentifier(11, 0, 1, 0, (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 9999))
+        vr = self.materialized_lut.get(SearchRange(start=oid, end=oid.inc()))
+        self.assertEqual(vr.type_, ValueType.NO_SUCH_INSTANCE)
@@ -1,9 +1,13 @@
 import os
 import sys
 
+# noinspection PyUnresolvedReferences
+import tests.mock_tables.dbconnector
+
 modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(modules_path, 'src'))
 
+import asyncio
 from unittest import TestCase
 
 from ax_interface import ValueType
@@ -12,7 +16,10 @@ from ax_interface.encodings import ObjectIdentifier
 from ax_interface.constants import PduTypes
 from ax_interface.pdu import PDU, PDUHeader
 from ax_interface.mib import MIBTable
+from sonic_ax_impl import mibs
 from sonic_ax_impl.mibs import ieee802_1ab
+from sonic_ax_impl.resp import RespPool
+from tests.mock_tables.resp_server import MockRespServer
 
 
 class TestLLDPMIB(TestCase):
@@ -21,8 +28,21 @@ class TestLLDPMIB(TestCase):
         class LLDPMIB(ieee802_1ab.LLDPRemTable, ieee802_1ab.LLDPLocPortTable):
             pass
 
+        # the LLDP tables are read over RESP.
+        cls.loop = asyncio.new_event_loop()
+        cls.server = MockRespServer()
+        cls.loop.run_until_complete(cls.server.start())
+        mibs.resp_pools[mibs.APPL_DB] = RespPool(mibs.DATABASES[mibs.APPL_DB], unix_socket_path=cls.server.path)
+        cls.loop.run_until_complete(LLDPMIB.lldp_updater.update_data())
+
         cls.lut = MIBTable(LLDPMIB)
 
+    @classmethod
+    def tearDownClass(cls):
+        mibs.close_resp_pools()
+        cls.loop.run_until_complete(cls.server.stop())
+        cls.loop.close()
+
     def test_getnextpdu_eth1(self):
         # oid.include = 1
         oid = ObjectIdentifier(12, 0, 1, 0, (1, 0, 8802, 1, 1, 2, 1, 4, 1, 1, 7, 1))
@@ -1,5 +1,9 @@
+import asyncio
+import ipaddress
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 
 import tests.mock_tables.dbconnector
@@ -9,11 +13,22 @@ sys.path.insert(0, os.path.join(modules_path, 'src'))
 
 from sonic_ax_impl import mibs
 
-class TestGetNextPDU(TestCase):
-    @classmethod
-    def setUpClass(cls):
-        pass
 
+class KeyspaceNotifications:
+    """
+    Stands in for the keyspace notification PubSub.
+    """
+    def __init__(self):
+        self.messages = []
+
+    def notify(self, key, event=b'hset'):
+        self.messages.append({'type': 'pmessage', 'pattern': None, 'channel': b'__keyspace@0__:' + key, 'data': event})
+
+    def get_message(self):
+        return self.messages.pop(0) if self.messages else None
+
+
+class TestMIBCachesAndFetches(TestCase):
     def test_init_sync_d_lag_tables(self):
         db_conn = mibs.init_db()
 
@@ -28,3 +43,311 @@ class TestGetNextPDU(TestCase):
 
         self.assertTrue(b"PortChannel_Temp" in lag_name_if_name_map)
         self.assertTrue(lag_name_if_name_map[b"PortChannel_Temp"] == [])
+
+    def test_get_all_bulk(self):
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.COUNTERS_DB)
+        sai_ids = [b'1000000000007', b'100000000000a']
+
+        counters = mibs.get_all_bulk(db_conn, mibs.COUNTERS_DB, [mibs.counter_table(sai_id) for sai_id in sai_ids])
+
+        self.assertEqual(len(counters), len(sai_ids))
+        for sai_id, entry in zip(sai_ids, counters):
+            self.assertEqual(entry, db_conn.get_all(mibs.COUNTERS_DB, mibs.counter_table(sai_id)))
+            self.assertTrue(entry)
+
+    def test_get_all_bulk_missing(self):
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.COUNTERS_DB)
+
+        results = mibs.get_all_bulk(db_conn, mibs.COUNTERS_DB, [b'COUNTERS:1000000000007', b'COUNTERS:nonexistent'])
+
+        self.assertTrue(results[0])
+        self.assertEqual(results[1], {})
+
+    def test_interface_counters_shared(self):
+        from sonic_ax_impl.mibs.ietf import rfc1213, rfc2863
+        interfaces = mibs.InterfaceCounters()
+        if_updater, ifx_updater = rfc1213.InterfacesUpdater(), rfc2863.InterfaceMIBUpdater()
+        if_updater.interfaces = ifx_updater.interfaces = interfaces
+        if_updater.snapshot = ifx_updater.snapshot = None
+
+        if_updater.update_data()
+        ifx_updater.update_data()
+
+        # one refresh serves both MIBs.
+        self.assertIs(if_updater.snapshot, ifx_updater.snapshot)
+        self.assertIs(if_updater.counters, ifx_updater.counters)
+        self.assertTrue(if_updater.counters.rows)
+
+        # the next cycle refreshes once more.
+        first = if_updater.snapshot
+        if_updater.update_data()
+        ifx_updater.update_data()
+        self.assertIsNot(if_updater.snapshot, first)
+        self.assertIs(if_updater.snapshot, ifx_updater.snapshot)
+
+    def test_interface_registry_rebuild(self):
+        registry = mibs.InterfaceRegistry()
+
+        interfaces = registry.refresh_interfaces()
+        # unchanged port name map--same tables.
+        self.assertIs(registry.refresh_interfaces(), interfaces)
+        self.assertNotIn(b'Ethernet1000', interfaces.if_name_map)
+
+        registry.db_conn.get_redis_client(mibs.COUNTERS_DB).hset(
+            mibs.COUNTERS_PORT_NAME_MAP, b'Ethernet1000', b'oid:0x1000000001000')
+        rebuilt = registry.refresh_interfaces()
+        self.assertIsNot(rebuilt, interfaces)
+        self.assertIn(b'Ethernet1000', rebuilt.if_name_map)
+
+    def test_appl_db_cache_notifications(self):
+        cache = mibs.ApplDbCache()
+        cache.notifications = KeyspaceNotifications()
+        client = cache.db_conn.get_redis_client(mibs.APPL_DB)
+        port = mibs.if_entry_table(b'Ethernet0')
+        lags = cache.lag_tables()
+        self.assertEqual(lags.lag_name_if_name_map[b'PortChannel04'], [b'Ethernet124'])
+
+        client.hset(port, b'mtu', b'1500')
+        # served from memory until notified.
+        self.assertIsNone(cache.get(port))
+        cache.notifications.notify(port)
+        cache.poll()
+        self.assertEqual(cache.get(port)[b'mtu'], b'1500')
+        # only PORT_TABLE changed.
+        self.assertIs(cache.lag_tables(), lags)
+
+        member = b'LAG_MEMBER_TABLE:PortChannel04:Ethernet124'
+        client.delete(member)
+        cache.notifications.notify(member, b'del')
+        cache.poll()
+        self.assertIsNone(cache.get(member))
+        self.assertEqual(cache.lag_tables().lag_name_if_name_map[b'PortChannel04'], [])
+        self.assertNotIn(b'Ethernet124', cache.lag_tables().if_name_lag_name_map)
+
+    def test_route_table(self):
+        routes = mibs.RouteTable()
+        routes.notifications = KeyspaceNotifications()
+        client = routes.db_conn.get_redis_client(mibs.APPL_DB)
+        first = routes.latest()
+        default = first.routes[b'ROUTE_TABLE:0.0.0.0/0']
+        self.assertEqual(default.prefix, ipaddress.ip_network('0.0.0.0/0'))
+        self.assertEqual(len(default.nexthops), 14)
+        index = first.cidr_index
+        # one row per next hop.
+        self.assertEqual(len(index), 14)
+        self.assertEqual(index[0], (0, 0, 0, 0, 0, 0, 0, 0, 0, 10, 0, 0, 1))
+
+        route = b'ROUTE_TABLE:192.168.1.0/24'
+        client.hmset(route, {b'nexthop': b'10.0.0.1,10.0.0.3,10.0.0.5', b'ifname': b'Ethernet0,eth0,Ethernet8'})
+        routes.notifications.notify(route)
+        v6_route = b'ROUTE_TABLE:fc00::/64'
+        client.hmset(v6_route, {b'nexthop': b'fc00::1', b'ifname': b'Ethernet0'})
+        routes.notifications.notify(v6_route)
+        second = routes.latest(first.generation)
+        # handed out snapshots never change.
+        self.assertEqual(len(index), 14)
+        self.assertNotIn(route, first.routes)
+        index = second.cidr_index
+        self.assertEqual(len(index), 16)
+        self.assertIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 5), index)
+        # non front panel interfaces are skipped.
+        self.assertNotIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 3), index)
+        # IPv6 routes are cached, but have no ipCidrRouteTable rows.
+        self.assertEqual(second.routes[v6_route].nexthops, ('fc00::1',))
+
+        client.hset(route, b'nexthop', b'10.0.0.1,10.0.0.5,10.0.0.7')
+        routes.notifications.notify(route)
+        third = routes.latest(second.generation)
+        self.assertEqual(len(third.cidr_index), 16)
+        self.assertNotIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 5), third.cidr_index)
+        self.assertIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 7), third.cidr_index)
+        self.assertIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 5), index)
+
+        # nothing changed: the next generation shares the routes and rows.
+        fourth = routes.latest(third.generation)
+        self.assertGreater(fourth.generation, third.generation)
+        self.assertIs(fourth.routes, third.routes)
+        self.assertIs(fourth.cidr_index, third.cidr_index)
+
+        client.delete(route)
+        routes.notifications.notify(route, b'del')
+        fifth = routes.latest(fourth.generation)
+        self.assertEqual(len(fifth.cidr_index), 14)
+        self.assertNotIn(route, fifth.routes)
+        self.assertIn(route, fourth.routes)
+
+        # without notifications, resyncs diff against the cached routes.
+        client.delete(b'ROUTE_TABLE:0.0.0.0/0')
+        routes.notifications = None
+        sixth = routes.latest(fifth.generation)
+        self.assertEqual(len(sixth.cidr_index), 0)
+        self.assertEqual(list(sixth.routes), [v6_route])
+
+    def test_route_table_generations(self):
+        routes = mibs.RouteTable()
+        routes.notifications = KeyspaceNotifications()
+        client = routes.db_conn.get_redis_client(mibs.APPL_DB)
+        route = mibs.route_entry_table(b'192.168.1.0/24')
+        first = routes.latest()
+
+        client.hmset(route, {b'nexthop': b'10.0.0.1', b'ifname': b'Ethernet0'})
+        routes.notifications.notify(route)
+        # not seen by this consumer yet: adopted as is.
+        self.assertIs(routes.latest(), first)
+        self.assertIsNone(routes.get(route))
+
+        second = routes.latest(first.generation)
+        self.assertNotEqual(second.generation, first.generation)
+        self.assertEqual(second.routes[route].nexthops, ('10.0.0.1',))
+        self.assertIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 1), second.cidr_index)
+        self.assertNotIn((192, 168, 1, 0, 255, 255, 255, 0, 0, 10, 0, 0, 1), first.cidr_index)
+        # the other consumers adopt the same generation.
+        self.assertIs(routes.latest(first.generation), second)
+
+    def test_route_table_shared(self):
+        from sonic_ax_impl.mibs.ietf.rfc1213 import NextHopUpdater
+        from sonic_ax_impl.mibs.ietf.rfc4292 import RouteUpdater
+
+        nexthop_updater, route_updater = NextHopUpdater(), RouteUpdater()
+
+        self.assertIs(nexthop_updater.routes, mibs.route_table())
+        self.assertIs(route_updater.routes, mibs.route_table())
+        self.assertEqual(nexthop_updater.nexthop((0, 0, 0, 0)), ipaddress.ip_address('10.0.0.1').packed)
+
+        # each refresh polls, or adopts the poll of the other consumer; off the loop too.
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        for updater in (nexthop_updater, route_updater):
+            updater.executor = executor
+        generations = (nexthop_updater.generation, route_updater.generation)
+
+        async def refresh():
+            await asyncio.gather(nexthop_updater.run_once(), route_updater.run_once())
+        loop.run_until_complete(refresh())
+        snapshot = mibs.route_table().snapshot
+        self.assertEqual(nexthop_updater.routes_seen, snapshot.generation)
+        self.assertEqual(route_updater.routes_seen, snapshot.generation)
+        self.assertIs(route_updater.route_dest_list, snapshot.cidr_index)
+        self.assertEqual((nexthop_updater.generation, route_updater.generation),
+                         (generations[0] + 1, generations[1] + 1))
+
+    def test_route_table_threads(self):
+        routes = mibs.RouteTable()
+        routes.notifications = KeyspaceNotifications()
+        polls = []
+        poll = routes.poll
+        routes.poll = lambda: polls.append(poll())
+        first = routes.latest()
+
+        # consumers that saw the same generation share a single poll.
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            snapshots = list(executor.map(routes.latest, [first.generation] * 8))
+        self.assertEqual(len(polls), 1)
+        self.assertEqual({snapshot.generation for snapshot in snapshots}, {first.generation + 1})
+
+    def test_appl_db_cache_lag_tables(self):
+        db_conn = mibs.init_db()
+        lags = mibs.ApplDbCache().lag_tables()
+
+        self.assertEqual(tuple(lags), mibs.init_sync_d_lag_tables(db_conn))
+
+    def test_get_fields_bulk(self):
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.COUNTERS_DB)
+        hashes = [b'COUNTERS:1000000000007', b'COUNTERS:nonexistent']
+        fields = [b'SAI_PORT_STAT_IF_IN_OCTETS', b'NOT_A_COUNTER']
+
+        results = mibs.get_fields_bulk(db_conn, mibs.COUNTERS_DB, hashes, fields)
+
+        full = db_conn.get_all(mibs.COUNTERS_DB, hashes[0])
+        self.assertEqual(results[0], [full[b'SAI_PORT_STAT_IF_IN_OCTETS'], None])
+        self.assertEqual(results[1], [None, None])
+
+    def test_interface_counters_fields(self):
+        interfaces = mibs.InterfaceCounters()
+        interfaces.register_fields(['SAI_PORT_STAT_IF_IN_OCTETS'])
+        first = interfaces.latest()
+        self.assertEqual(first.counters.columns, {'SAI_PORT_STAT_IF_IN_OCTETS': 0})
+
+        # registering more fields retires the snapshot.
+        interfaces.register_fields(['SAI_PORT_STAT_IF_IN_OCTETS', 'SAI_PORT_STAT_IF_OUT_OCTETS'])
+        snapshot = interfaces.latest(first)
+        self.assertIsNot(snapshot, first)
+        self.assertEqual(snapshot.counters.columns['SAI_PORT_STAT_IF_OUT_OCTETS'], 1)
+        for oid, sai_id in snapshot.oid_sai_map.items():
+            full = interfaces.db_conn.get_all(mibs.COUNTERS_DB, mibs.counter_table(sai_id))
+            self.assertEqual(snapshot.counters.get(oid, 'SAI_PORT_STAT_IF_OUT_OCTETS'),
+                             int(full[b'SAI_PORT_STAT_IF_OUT_OCTETS']))
+
+    def test_counter_matrix(self):
+        fields = [b'SAI_PORT_STAT_IF_IN_OCTETS', b'SAI_PORT_STAT_IF_OUT_QLEN']
+        port_counters = {
+            1: [b'10', b'1'],
+            5: [b'18446744073709551615', None],
+            9: [b'7', b'not a number'],
+        }
+        counters = mibs.CounterMatrix(fields, port_counters, {1000: [1, 5], 1004: [1], 1008: []})
+
+        self.assertEqual(counters.get(1, 'SAI_PORT_STAT_IF_IN_OCTETS'), 10)
+        self.assertIsNone(counters.get(5, 'SAI_PORT_STAT_IF_OUT_QLEN'))
+        self.assertIsNone(counters.get(9, 'SAI_PORT_STAT_IF_OUT_QLEN'))
+        self.assertIsNone(counters.get(2, 'SAI_PORT_STAT_IF_IN_OCTETS'))
+        self.assertIsNone(counters.get(1, 'NOT_A_COUNTER'))
+        # LAGs sum their members (modulo 2^64)...
+        self.assertEqual(counters.get(1000, 'SAI_PORT_STAT_IF_IN_OCTETS'), 9)
+        self.assertEqual(counters.get(1004, 'SAI_PORT_STAT_IF_OUT_QLEN'), 1)
+        self.assertEqual(counters.get(1008, 'SAI_PORT_STAT_IF_IN_OCTETS'), 0)
+        # ...unless one of them is missing the counter.
+        self.assertIsNone(counters.get(1000, 'SAI_PORT_STAT_IF_OUT_QLEN'))
+
+    def test_get_all_within(self):
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.COUNTERS_DB)
+        misses = mibs.fetch_misses[mibs.COUNTERS_DB]
+
+        self.assertTrue(mibs.get_all_within(db_conn, mibs.COUNTERS_DB, b'COUNTERS:1000000000007'))
+        self.assertEqual(mibs.fetch_misses[mibs.COUNTERS_DB], misses)
+
+        start = time.monotonic()
+        self.assertEqual(mibs.get_all_within(db_conn, mibs.COUNTERS_DB, b'COUNTERS:nonexistent', timeout=0.02), {})
+        self.assertGreaterEqual(time.monotonic() - start, 0.02)
+        self.assertEqual(mibs.fetch_misses[mibs.COUNTERS_DB], misses + 1)
+
+        # blocking bulk fetches give up on missing hashes, too, with one deadline for all of them.
+        start = time.monotonic()
+        results = mibs.get_all_bulk(db_conn, mibs.COUNTERS_DB, [b'COUNTERS:nonexistent', b'COUNTERS:1000000000007',
+                                                                b'COUNTERS:nonexistent2'], blocking=True, timeout=0.1)
+        self.assertLess(time.monotonic() - start, 0.2)
+        self.assertEqual(results[0], {})
+        self.assertTrue(results[1])
+        self.assertEqual(results[2], {})
+        self.assertEqual(mibs.fetch_misses[mibs.COUNTERS_DB], misses + 3)
+
+    def test_get_all_within_event_loop(self):
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.COUNTERS_DB)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def fetch():
+            return mibs.get_all_within(db_conn, mibs.COUNTERS_DB, b'COUNTERS:nonexistent', timeout=10)
+
+        # the event loop never waits.
+        start = time.monotonic()
+        self.assertEqual(loop.run_until_complete(fetch()), {})
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_scan_keys(self):
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.ASIC_DB)
+        pattern = "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:*"
+
+        keys = list(mibs.scan_keys(db_conn, mibs.ASIC_DB, pattern, count=3))
+
+        self.assertTrue(keys)
+        self.assertEqual(sorted(keys), sorted(db_conn.keys(mibs.ASIC_DB, pattern)))
+        self.assertEqual(list(mibs.scan_keys(db_conn, mibs.ASIC_DB, "NOT_A_TABLE:*")), [])
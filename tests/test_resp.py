@@ -0,0 +1,103 @@
+import os
+import sys
+
+# noinspection PyUnresolvedReferences
+import tests.mock_tables.dbconnector
+
+modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(modules_path, 'src'))
+
+import asyncio
+from unittest import TestCase
+
+from sonic_ax_impl import mibs
+from sonic_ax_impl.resp import RespConnection, RespError, RespPool, encode_command
+from tests.mock_tables.resp_server import MockRespServer
+
+
+class TestResp(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = MockRespServer()
+        self.loop.run_until_complete(self.server.start())
+        self.pool = RespPool(mibs.DATABASES[mibs.COUNTERS_DB], size=2, unix_socket_path=self.server.path)
+
+    def tearDown(self):
+        self.pool.close()
+        self.loop.run_until_complete(self.server.stop())
+        self.loop.close()
+
+    def test_encode_command(self):
+        self.assertEqual(encode_command('HMGET', b'COUNTERS:1', 2),
+                         b'*3\r\n$5\r\nHMGET\r\n$10\r\nCOUNTERS:1\r\n$1\r\n2\r\n')
+
+    def test_pipeline(self):
+        replies = self.loop.run_until_complete(self.pool.pipeline([
+            ('HMGET', b'COUNTERS:1000000000007', b'SAI_PORT_STAT_IF_IN_OCTETS', b'NOT_A_COUNTER'),
+            ('HGETALL', b'COUNTERS:nonexistent'),
+            ('NOT_A_COMMAND',),
+            ('PING',),
+        ]))
+
+        counters = self.server.database(mibs.DATABASES[mibs.COUNTERS_DB]).hgetall(b'COUNTERS:1000000000007')
+        self.assertEqual(replies[0], [counters[b'SAI_PORT_STAT_IF_IN_OCTETS'], None])
+        self.assertEqual(replies[1], [])
+        # errors do not derail the rest of the pipeline.
+        self.assertIsInstance(replies[2], RespError)
+        self.assertEqual(replies[3], b'PONG')
+
+    def test_execute_error(self):
+        with self.assertRaises(RespError):
+            self.loop.run_until_complete(self.pool.execute('NOT_A_COMMAND'))
+
+    def test_pool_reuse(self):
+        async def fetch_all():
+            return await asyncio.gather(*(self.pool.execute('KEYS', 'COUNTERS:*') for _ in range(5)))
+
+        results = self.loop.run_until_complete(fetch_all())
+
+        self.assertTrue(results[0])
+        self.assertTrue(all(result == results[0] for result in results))
+        # never more connections than the pool size.
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(len(self.pool.idle), 2)
+
+    def test_timeout(self):
+        async def silent(reader, writer):
+            # reads the commands, never replies.
+            await reader.read()
+            writer.close()
+
+        path = os.path.join(self.server.directory, 'silent.sock')
+        server = self.loop.run_until_complete(asyncio.start_unix_server(silent, path))
+        pool = RespPool(size=1, unix_socket_path=path, timeout=0.05)
+        try:
+            for _ in range(2):
+                with self.assertRaises(asyncio.TimeoutError):
+                    self.loop.run_until_complete(pool.execute('PING'))
+            # the stalled connection is dropped, and its slot released.
+            self.assertEqual(pool.idle, [])
+        finally:
+            server.close()
+            self.loop.run_until_complete(server.wait_closed())
+
+    def test_select(self):
+        connection = self.loop.run_until_complete(RespConnection.open(mibs.DATABASES[mibs.APPL_DB],
+                                                                      unix_socket_path=self.server.path))
+        try:
+            keys = self.loop.run_until_complete(connection.execute('KEYS', 'LLDP_ENTRY_TABLE:*'))
+        finally:
+            connection.close()
+        self.assertTrue(keys)
+
+    def test_async_get_fields_bulk(self):
+        mibs.resp_pools[mibs.COUNTERS_DB] = self.pool
+        self.addCleanup(mibs.resp_pools.clear)
+        db_conn = mibs.init_db()
+        db_conn.connect(mibs.COUNTERS_DB)
+        hashes = [b'COUNTERS:1000000000007', b'COUNTERS:nonexistent']
+        fields = [b'SAI_PORT_STAT_IF_IN_OCTETS', b'NOT_A_COUNTER']
+
+        results = self.loop.run_until_complete(mibs.async_get_fields_bulk(mibs.COUNTERS_DB, hashes, fields))
+
+        self.assertEqual(results, mibs.get_fields_bulk(db_conn, mibs.COUNTERS_DB, hashes, fields))
@@ -0,0 +1,160 @@
+import os
+import sys
+
+modules_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(modules_path, 'src'))
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from ax_interface import MIBUpdater
+from ax_interface.scheduler import UpdateScheduler
+
+
+class CountersUpdater(MIBUpdater):
+    def __init__(self, duration=0):
+        super().__init__()
+        self.duration = duration
+        self.runs = 0
+
+    async def run_once(self):
+        self.runs += 1
+        await asyncio.sleep(self.duration)
+
+    def update_data(self):
+        pass
+
+
+class LLDPUpdater(CountersUpdater):
+    pass
+
+
+class RouteUpdater(CountersUpdater):
+    pass
+
+
+class FdbUpdater(MIBUpdater):
+    def __init__(self):
+        super().__init__()
+        self.runs = 0
+
+    async def update_data(self):
+        await asyncio.sleep(0)
+        self.runs += 1
+
+
+class BlockingUpdater(MIBUpdater):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.rows = []
+
+    def update_data(self):
+        self.started.set()
+        self.release.wait(5)
+        self.rows = [(1,)]
+
+
+class TestUpdateScheduler(TestCase):
+    def test_schedule(self):
+        counters, lldp, route = CountersUpdater(), LLDPUpdater(), RouteUpdater()
+        scheduler = UpdateScheduler({route, lldp, counters}, 5, {'CountersUpdater': 1, 'LLDPUpdater': 30}, 60)
+
+        due = scheduler.schedule(100)
+
+        # phased across their own interval, in class name order.
+        self.assertEqual(due, {counters: 100, lldp: 110, route: 100 + 10 / 3})
+        self.assertEqual((counters.frequency, lldp.frequency, route.frequency), (1, 30, 5))
+        self.assertEqual((counters.reinit_rate, lldp.reinit_rate, route.reinit_rate), (60, 2, 12))
+
+    def test_next_slot(self):
+        self.assertEqual(UpdateScheduler.next_slot(10, 10, 5), 15)
+        # missed slots are skipped, the phase is kept.
+        self.assertEqual(UpdateScheduler.next_slot(10, 27, 5), 30)
+
+    def test_overrun_skipped(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+        fast, slow = CountersUpdater(), LLDPUpdater(duration=0.25)
+        scheduler = UpdateScheduler([fast, slow], 0.1)
+        event = asyncio.Event()
+        event.set()
+
+        async def stop():
+            await asyncio.sleep(0.55)
+            event.clear()
+
+        loop.run_until_complete(asyncio.gather(scheduler.run(event), stop()))
+
+        self.assertGreaterEqual(fast.runs, 4)
+        self.assertLessEqual(slow.runs, 3)
+        self.assertGreater(scheduler.skipped, 0)
+
+    def test_dormant_not_refreshed(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+        active, dormant = CountersUpdater(), LLDPUpdater()
+        dormant.idle_timeout = 10
+        dormant.last_access -= 11
+        scheduler = UpdateScheduler([active, dormant], 0.1)
+        event = asyncio.Event()
+        event.set()
+
+        async def stop():
+            await asyncio.sleep(0.35)
+            event.clear()
+
+        loop.run_until_complete(asyncio.gather(scheduler.run(event), stop()))
+
+        self.assertGreater(active.runs, 0)
+        self.assertEqual(dormant.runs, 0)
+        self.assertEqual(scheduler.skipped, 0)
+
+    def test_coroutine_updater(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+        counters, fdb = CountersUpdater(), FdbUpdater()
+        scheduler = UpdateScheduler([counters, fdb], 5)
+        self.assertTrue(fdb.is_coroutine)
+        self.assertFalse(counters.is_coroutine)
+
+        # not seeded by its constructor--due right away.
+        self.assertEqual(scheduler.schedule(100), {counters: 100, fdb: 100})
+
+        loop.run_until_complete(fdb.run_once())
+        self.assertEqual((fdb.runs, fdb.generation), (1, 1))
+        self.assertEqual(scheduler.schedule(100)[fdb], 102.5)
+
+    def test_off_loop_keeps_loop_state(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        updater = BlockingUpdater()
+        updater.executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(updater.executor.shutdown)
+
+        async def refresh():
+            update = asyncio.ensure_future(updater.update_off_loop())
+            await loop.run_in_executor(None, updater.started.wait, 5)
+            # queried while the worker runs.
+            updater.accessed()
+            last_access = updater.last_access
+            updater.release.set()
+            await update
+            return last_access
+
+        last_access = loop.run_until_complete(refresh())
+
+        self.assertEqual(updater.rows, [(1,)])
+        self.assertEqual(updater.last_access, last_access)